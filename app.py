@@ -4,14 +4,24 @@ A ChatGPT-style conversational interface for analyzing news with dual LLM valida
 """
 
 import streamlit as st
+import html
+import io
 import json
+import logging
 import os
 import re
+import time
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 
-from news_fetcher import fetch_news, NewsFetcherError
-from llm_analyzer import analyze_articles, AnalyzerError
-from llm_validator import validate_analyses, ValidatorError
+# Streamlit only configures its own loggers; send the pipeline's progress lines to the
+# console too (a no-op on reruns, once the root logger has a handler)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+# The pipeline modules (and the openai/requests SDKs behind them) are imported
+# inside the functions that use them, so cold starts and the welcome screen
+# don't pay for them.
 
 # Page configuration
 st.set_page_config(
@@ -21,510 +31,283 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for ChatGPT-style dark theme
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Root variables */
-    :root {
-        --bg-primary: #0f0f0f;
-        --bg-secondary: #1a1a1a;
-        --bg-tertiary: #252525;
-        --accent-purple: #8b5cf6;
-        --accent-blue: #3b82f6;
-        --accent-green: #10b981;
-        --accent-red: #ef4444;
-        --accent-yellow: #f59e0b;
-        --text-primary: #ffffff;
-        --text-secondary: #a1a1aa;
-        --border-color: #333333;
-    }
-    
-    /* Global styles */
-    .stApp {
-        background: linear-gradient(135deg, var(--bg-primary) 0%, #1a1a2e 100%);
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1a1a2e 0%, #16213e 100%);
-        border-right: 1px solid rgba(139, 92, 246, 0.2);
-    }
-    
-    [data-testid="stSidebar"] .stMarkdown {
-        color: var(--text-primary);
-    }
+STYLES_PATH = os.path.join(os.path.dirname(__file__), "static", "styles.css")
 
-    /* Fixed Sidebar Selectbox Styling */
-    section[data-testid="stSidebar"] [data-baseweb="select"] > div {
-        background-color: #1a1a2e !important;
-        color: white !important;
-        border-color: rgba(139, 92, 246, 0.4) !important;
-        border-radius: 8px !important;
-    }
+# Static page markup, built once at import instead of inside the render functions.
+# Pure-HTML blocks go through st.html, which skips the frontend markdown parser;
+# anything with markdown or target="_blank" links stays on st.markdown.
+PAGE_HEADER = """
+<div style="text-align: center; padding: 1rem 0 2rem 0;">
+    <h1 style="font-size: 2.2rem; background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 50%, #10b981 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">📰 News Analyzer AI</h1>
+    <p style="color: #a1a1aa;">Ask me about any news topic and I'll analyze it for you</p>
+</div>
+"""
 
-    section[data-testid="stSidebar"] [data-baseweb="select"] span {
-        color: white !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-baseweb="select"] svg {
-        fill: white !important;
-    }
+WELCOME_HTML = """
+<div class="welcome-box">
+    <h2>👋 Hi! I'm your News Analyzer</h2>
+    <p style="color: #a1a1aa; max-width: 500px; margin: 0 auto;">
+        Ask me to analyze news on any topic. I use <strong>dual AI validation</strong> to give you accurate sentiment analysis.
+    </p>
+    <div class="example-queries">
+        <div class="example-query">🇮🇳 "Analyze India politics news"</div>
+        <div class="example-query">💹 "Get stock market updates"</div>
+        <div class="example-query">🌍 "What's happening globally?"</div>
+        <div class="example-query">💻 "5 articles about AI technology"</div>
+    </div>
+</div>
+"""
 
-    /* Dropdown Options Styling */
-    [data-baseweb="popover"], [data-baseweb="menu"] {
-        background-color: #1a1a2e !important;
-        border: 1px solid rgba(139, 92, 246, 0.4) !important;
-    }
+SIDEBAR_HEADER = """
+<div style="text-align: center; padding: 1rem 0;">
+    <h2 style="background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; margin-bottom: 0.5rem;">⚡ News Analyzer</h2>
+    <p style="color: #a1a1aa; font-size: 0.9rem;">Chat with AI about news</p>
+</div>
+"""
 
-    [data-baseweb="menu"] > ul > li {
-        background-color: transparent !important;
-        color: white !important;
-    }
+# Sidebar quick commands: (button label, chat prompt)
+QUICK_COMMANDS = (
+    ("🇮🇳 India Politics News", "Analyze India politics news"),
+    ("💻 Tech Trends", "Get 5 articles about technology"),
+    ("💹 Stock Market", "What's happening in the stock market?"),
+    ("🌍 Global Climate", "Search for 15 articles on climate"),
+)
 
-    [data-baseweb="menu"] > ul > li:hover, [data-baseweb="menu"] > ul > li[aria-selected="true"] {
-        background-color: rgba(139, 92, 246, 0.2) !important;
-    }    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Fix bottom chat input area background */
-    [data-testid="stBottom"] {
-        background: transparent !important;
-    }
-    
-    [data-testid="stBottom"] > div {
-        background: linear-gradient(180deg, transparent 0%, rgba(15, 15, 15, 0.95) 30%, #0f0f0f 100%) !important;
-        padding-top: 2rem !important;
-    }
-    
-    .stChatFloatingInputContainer {
-        background: transparent !important;
-    }
-    
-    /* Chat messages */
-    .chat-message {
-        padding: 1.5rem;
-        border-radius: 16px;
-        margin-bottom: 1rem;
-        display: flex;
-        gap: 1rem;
-    }
-    
-    .chat-message.user {
-        background: linear-gradient(135deg, #2d2d4a 0%, #1e293b 100%);
-        border: 1px solid rgba(59, 130, 246, 0.3);
-    }
-    
-    .chat-message.assistant {
-        background: linear-gradient(135deg, #1e1e2e 0%, #252540 100%);
-        border: 1px solid rgba(139, 92, 246, 0.3);
-    }
-    
-    .chat-message .avatar {
-        width: 40px;
-        height: 40px;
-        border-radius: 12px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.5rem;
-        flex-shrink: 0;
-    }
-    
-    .chat-message.user .avatar {
-        background: linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%);
-    }
-    
-    .chat-message.assistant .avatar {
-        background: linear-gradient(135deg, #8b5cf6 0%, #6366f1 100%);
-    }
-    
-    .chat-message .content {
-        flex: 1;
-        color: #fff;
-        line-height: 1.6;
-    }
-    
-    .chat-message .content p {
-        margin: 0;
-    }
-    
-    /* Article cards */
-    .article-card {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-        border: 1px solid rgba(139, 92, 246, 0.2);
-        border-radius: 16px;
-        padding: 1.25rem;
-        margin: 0.75rem 0;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
-    }
-    
-    .article-card:hover {
-        transform: translateY(-2px);
-        border-color: rgba(139, 92, 246, 0.5);
-    }
-    
-    .article-title {
-        font-size: 1rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        margin-bottom: 0.5rem;
-    }
-    
-    .article-title a {
-        color: #8b5cf6;
-        text-decoration: none;
-    }
-    
-    .article-title a:hover {
-        color: #a78bfa;
-    }
-    
-    /* Sentiment badges */
-    .sentiment-positive {
-        display: inline-block;
-        background: linear-gradient(135deg, #059669 0%, #10b981 100%);
-        color: white;
-        padding: 0.25rem 0.65rem;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        font-weight: 500;
-    }
-    
-    .sentiment-negative {
-        display: inline-block;
-        background: linear-gradient(135deg, #dc2626 0%, #ef4444 100%);
-        color: white;
-        padding: 0.25rem 0.65rem;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        font-weight: 500;
-    }
-    
-    .sentiment-neutral {
-        display: inline-block;
-        background: linear-gradient(135deg, #4b5563 0%, #6b7280 100%);
-        color: white;
-        padding: 0.25rem 0.65rem;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        font-weight: 500;
-    }
-    
-    /* Tone badge */
-    .tone-badge {
-        display: inline-block;
-        background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%);
-        color: white;
-        padding: 0.25rem 0.65rem;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        font-weight: 500;
-        margin-left: 0.5rem;
-    }
-    
-    /* Validation status */
-    .validation-valid {
-        color: #10b981;
-        font-size: 0.85rem;
-        margin-top: 0.5rem;
-    }
-    
-    .validation-invalid {
-        color: #ef4444;
-        font-size: 0.85rem;
-        margin-top: 0.5rem;
-    }
-    
-    /* Stats cards */
-    .stat-card {
-        background: linear-gradient(135deg, #1a1a2e 0%, #252540 100%);
-        border: 1px solid rgba(139, 92, 246, 0.2);
-        border-radius: 12px;
-        padding: 1rem;
-        text-align: center;
-    }
-    
-    .stat-number {
-        font-size: 2rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    .stat-label {
-        color: var(--text-secondary);
-        font-size: 0.85rem;
-        margin-top: 0.25rem;
-    }
-    
-    /* Gist text */
-    .gist-text {
-        font-style: italic;
-        color: #a1a1aa;
-        background: rgba(139, 92, 246, 0.1);
-        padding: 0.75rem;
-        border-radius: 8px;
-        border-left: 3px solid #8b5cf6;
-        margin: 0.5rem 0;
-        font-size: 0.9rem;
-    }
-    
-    /* Source info */
-    .source-info {
-        color: #71717a;
-        font-size: 0.8rem;
-        margin-top: 0.5rem;
-    }
-    
-    /* Custom divider */
-    .custom-divider {
-        height: 1px;
-        background: linear-gradient(90deg, transparent 0%, rgba(139, 92, 246, 0.3) 50%, transparent 100%);
-        margin: 1.5rem 0;
-    }
-    
-    /* Chat input styling - centered and curved */
-    /* Chat input styling - centered and curved */
-    [data-testid="stChatInput"] {
-        max-width: 700px !important;
-        margin: 0 auto !important;
-        padding: 0.5rem 1rem !important;
-    }
-    
-    [data-testid="stChatInput"] > div {
-        background: linear-gradient(135deg, #1a1a2e 0%, #252540 100%) !important;
-        border: 1px solid rgba(139, 92, 246, 0.4) !important;
-        border-radius: 28px !important;
-        padding: 0.25rem 0.5rem !important;
-        box-shadow: 0 4px 20px rgba(139, 92, 246, 0.15) !important;
-        color: white !important;
-    }
-    
-    [data-testid="stChatInput"] textarea, [data-testid="stChatInput"] input {
-        color: #e4e4e7 !important;
-        background-color: transparent !important;
-        background: transparent !important;
-        font-size: 0.95rem !important;
-        caret-color: #8b5cf6 !important;
-    }
-    
-    /* Deep targeting for chat input background */
-    [data-testid="stChatInput"] [data-baseweb="textarea"], 
-    [data-testid="stChatInput"] [data-baseweb="base-input"] {
-        background-color: transparent !important;
-        background: transparent !important;
-    }
-    
-    [data-testid="stChatInput"] textarea::placeholder {
-        color: #71717a !important;
-    }
-    
-    [data-testid="stChatInput"] button {
-        background: linear-gradient(135deg, #8b5cf6 0%, #6366f1 100%) !important;
-        border-radius: 50% !important;
-        width: 35px !important;
-        height: 35px !important;
-        padding: 0 !important;
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        color: white !important;
-    }
+CATEGORIES = ("General", "Politics", "Technology", "Business", "Entertainment", "Health", "Science", "Sports")
 
-    /* Style the input container specifically */
-    .stChatInputContainer {
-        padding-bottom: 1rem !important;
-    }
-    
-    /* Welcome box */
-    .welcome-box {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-        border: 1px solid rgba(139, 92, 246, 0.2);
-        border-radius: 20px;
-        padding: 2rem;
-        text-align: center;
-        margin: 2rem 0;
-    }
-    
-    .welcome-box h2 {
-        background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 1rem;
-    }
-    
-    .example-queries {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.75rem;
-        justify-content: center;
-        margin-top: 1.5rem;
-    }
-    
-    .example-query {
-        background: rgba(139, 92, 246, 0.1);
-        border: 1px solid rgba(139, 92, 246, 0.3);
-        border-radius: 20px;
-        padding: 0.5rem 1rem;
-        color: #a78bfa;
-        font-size: 0.9rem;
-        cursor: pointer;
-        transition: all 0.2s ease;
-    }
-    
-    .example-query:hover {
-        background: rgba(139, 92, 246, 0.2);
-        border-color: rgba(139, 92, 246, 0.5);
-    }
-</style>
-""", unsafe_allow_html=True)
+SIDEBAR_FOOTER = """
+<div class='custom-divider'></div>
+
+### ℹ️ How it works
+
+<div style="color: #a1a1aa; font-size: 0.85rem; line-height: 1.6;">
+1️⃣ <strong>You ask</strong> about any news topic<br><br>
+2️⃣ <strong>GPT-4o-mini</strong> analyzes the articles<br><br>
+3️⃣ <strong>Nemotron</strong> validates the analysis<br><br>
+4️⃣ <strong>You get</strong> sentiment & insights
+</div>
+
+<div class='custom-divider'></div>
+
+<div style="text-align: center; color: #71717a; font-size: 0.8rem;">
+    Built by <a href="https://cv.vivekmind.com" target="_blank" style="color: #8b5cf6;">Vivek</a>
+</div>
+"""
 
+# Minimum seconds between per-article progress labels while the pipeline runs
+STATUS_UPDATE_INTERVAL = 0.2
 
+# Older chat turns are hidden behind a toggle to keep reruns cheap,
+# and the history itself is capped so sessions can't grow without bound
+MAX_VISIBLE_MESSAGES = 20
+MAX_MESSAGES = 200
+
+
+@st.cache_resource
+def _load_css() -> str:
+    """Build the ChatGPT-style dark theme <style> block once per server process."""
+    with open(STYLES_PATH, "r", encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
+
+
+# Badge lookups for article cards
+SENTIMENT_CLASSES = {
+    "positive": "sentiment-positive",
+    "negative": "sentiment-negative",
+    "neutral": "sentiment-neutral",
+}
+VALIDATION_BADGES = {
+    True: ("validation-valid", "✓"),
+    False: ("validation-invalid", "✗"),
+}
+
+
+@lru_cache(maxsize=16)
 def get_sentiment_class(sentiment: str) -> str:
     """Get CSS class for sentiment badge."""
-    sentiment = sentiment.lower()
-    if sentiment == "positive":
-        return "sentiment-positive"
-    elif sentiment == "negative":
-        return "sentiment-negative"
-    return "sentiment-neutral"
+    return SENTIMENT_CLASSES.get(sentiment.lower(), "sentiment-neutral")
+
+
+# Article card shell, filled with %-formatting; every field is HTML-escaped first
+ARTICLE_CARD_TEMPLATE = """
+<div class="article-card">
+    <div class="article-title">
+        <a href="%(url)s" target="_blank">📰 %(title)s</a>
+    </div>
+    <div class="gist-text">"%(gist)s"</div>
+    <div>
+        <span class="%(sentiment_class)s">%(sentiment)s</span>
+        <span class="tone-badge">%(tone)s</span>
+    </div>
+    <div class="%(validation_class)s">%(validation_icon)s %(validation_notes)s</div>%(details)s
+    <div class="source-info">Source: %(source)s</div>
+</div>
+"""
+
+# Stats panel shell for an assistant turn, filled with %-formatting
+STATS_PANEL_TEMPLATE = """
+<div style="display: grid; grid-template-columns: repeat(5, 1fr); gap: 1rem; margin: 1rem 0;">
+    <div class="stat-card">
+        <div class="stat-number">%(total)d</div>
+        <div class="stat-label">Total</div>
+    </div>
+    <div class="stat-card">
+        <div class="stat-number" style="background: linear-gradient(135deg, #059669, #10b981); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">%(positive)d</div>
+        <div class="stat-label">Positive</div>
+    </div>
+    <div class="stat-card">
+        <div class="stat-number" style="background: linear-gradient(135deg, #dc2626, #ef4444); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">%(negative)d</div>
+        <div class="stat-label">Negative</div>
+    </div>
+    <div class="stat-card">
+        <div class="stat-number" style="background: linear-gradient(135deg, #4b5563, #6b7280); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">%(neutral)d</div>
+        <div class="stat-label">Neutral</div>
+    </div>
+    <div class="stat-card">
+        <div class="stat-number">%(validation_rate)d%%</div>
+        <div class="stat-label">Validated</div>
+    </div>
+</div>
+"""
+
+# Pipeline inspector architecture diagram, filled with %-formatting
+PIPELINE_DIAGRAM_TEMPLATE = """
+<div style="background: #0f0f0f; padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem; border: 1px solid rgba(139, 92, 246, 0.2);">
+    <div style="display: flex; justify-content: space-between; align-items: center; text-align: center; position: relative;">
+        <div style="flex: 1;">
+            <div style="font-size: 2rem;">👤</div>
+            <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">User Query</div>
+            <div style="font-size: 0.7rem; color: #71717a; margin-top: 0.2rem;">"%(query)s"</div>
+        </div>
+        <div style="font-size: 1.5rem; color: #4b5563;">➜</div>
+         <div style="flex: 1;">
+            <div style="font-size: 2rem;">🌍</div>
+            <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">NewsAPI</div>
+             <div style="font-size: 0.7rem; color: #71717a; margin-top: 0.2rem;">%(articles_fetched)d articles</div>
+        </div>
+        <div style="font-size: 1.5rem; color: #4b5563;">➜</div>
+        <div style="flex: 1; position: relative;">
+            <div style="font-size: 2rem; filter: drop-shadow(0 0 10px rgba(139, 92, 246, 0.3));">🧠</div>
+            <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">LLM #1<br>(GPT-4o)</div>
+            <span style="position: absolute; top: -10px; right: 10px; background: #8b5cf6; color: white; font-size: 0.6rem; padding: 2px 6px; border-radius: 10px;">Analysis</span>
+        </div>
+        <div style="font-size: 1.5rem; color: #4b5563;">➜</div>
+        <div style="flex: 1; position: relative;">
+            <div style="font-size: 2rem; filter: drop-shadow(0 0 10px rgba(16, 185, 129, 0.3));">🛡️</div>
+            <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">LLM #2<br>(Nemotron)</div>
+             <span style="position: absolute; top: -10px; right: 10px; background: #10b981; color: white; font-size: 0.6rem; padding: 2px 6px; border-radius: 10px;">Validation</span>
+        </div>
+    </div>
+    <div style="margin-top: 1rem; text-align: center; font-size: 0.75rem; color: #52525b; font-style: italic;">
+        Double-Agent Verification Architecture
+    </div>
+</div>
+"""
+
+# Chat bubble shell, filled once when a message is added to the history
+CHAT_BUBBLE_TEMPLATE = """
+<div class="chat-message %(role)s">
+    <div class="avatar">%(avatar)s</div>
+    <div class="content"><p>%(content)s</p></div>
+</div>
+"""
+CHAT_AVATARS = {"user": "👤", "assistant": "🤖"}
+
+# Full validator feedback, collapsed inside the card (no st.expander per article)
+VALIDATION_DETAILS_TEMPLATE = (
+    '<details class="validation-details"><summary>🔍 Validation details</summary>'
+    '<p>%(notes)s</p>%(corrections)s</details>'
+)
+
+
+def render_validation_details(validation: dict) -> str:
+    """Render the full validation notes and corrections, or "" if the card already shows everything."""
+    notes = validation.get("validation_notes", "")
+    suggested = validation.get("suggested_corrections")
+    if len(notes) <= 80 and not suggested:
+        return ""
+    
+    corrections = ""
+    if isinstance(suggested, dict) and suggested:
+        corrections = "<p><strong>Suggested corrections:</strong> %s</p>" % html.escape(
+            ", ".join(f"{k}: {v}" for k, v in suggested.items())
+        )
+    return VALIDATION_DETAILS_TEMPLATE % {"notes": html.escape(notes), "corrections": corrections}
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to limit characters plus an ellipsis; short text is returned as is."""
+    return text if len(text) <= limit else text[:limit] + "…"
 
 
 def render_article_card(result: dict, index: int) -> str:
     """Render a single article analysis card as HTML."""
     title = result.get("title", "Unknown Title")
-    url = result.get("url", "#")
-    source = result.get("source", "Unknown")
     
     analysis = result.get("analysis", {})
-    gist = analysis.get("gist", "No summary available")
     sentiment = analysis.get("sentiment", "neutral")
-    tone = analysis.get("tone", "informative")
     
     validation = result.get("validation", {})
-    is_valid = validation.get("is_valid", False)
-    validation_notes = validation.get("validation_notes", "")[:80]
-    
-    sentiment_class = get_sentiment_class(sentiment)
-    validation_class = "validation-valid" if is_valid else "validation-invalid"
-    validation_icon = "✓" if is_valid else "✗"
-    
-    return f"""
-    <div class="article-card">
-        <div class="article-title">
-            <a href="{url}" target="_blank">📰 {title[:70]}{'...' if len(title) > 70 else ''}</a>
-        </div>
-        <div class="gist-text">"{gist}"</div>
-        <div>
-            <span class="{sentiment_class}">{sentiment.capitalize()}</span>
-            <span class="tone-badge">{tone.capitalize()}</span>
-        </div>
-        <div class="{validation_class}">{validation_icon} {validation_notes}</div>
-        <div class="source-info">Source: {source}</div>
-    </div>
-    """
+    validation_class, validation_icon = VALIDATION_BADGES[bool(validation.get("is_valid", False))]
+    
+    return ARTICLE_CARD_TEMPLATE % {
+        "url": html.escape(result.get("url", "#")),
+        "title": html.escape(_truncate(title, 70)),
+        "gist": html.escape(analysis.get("gist", "No summary available")),
+        "sentiment_class": get_sentiment_class(sentiment),
+        "sentiment": html.escape(sentiment.capitalize()),
+        "tone": html.escape(analysis.get("tone", "informative").capitalize()),
+        "validation_class": validation_class,
+        "validation_icon": validation_icon,
+        "validation_notes": html.escape(_truncate(validation.get("validation_notes", ""), 80)),
+        "details": render_validation_details(validation),
+        "source": html.escape(result.get("source", "Unknown")),
+    }
 
 
-def render_stats_html(results: list) -> str:
-    """Render statistics as HTML."""
-    total = len(results)
-    positive = sum(1 for r in results if r.get("analysis", {}).get("sentiment") == "positive")
-    negative = sum(1 for r in results if r.get("analysis", {}).get("sentiment") == "negative")
-    neutral = sum(1 for r in results if r.get("analysis", {}).get("sentiment") == "neutral")
-    validated = sum(1 for r in results if r.get("validation", {}).get("is_valid", False))
-    validation_rate = int((validated / total) * 100) if total > 0 else 0
-    
-    return f"""
-    <div style="display: grid; grid-template-columns: repeat(5, 1fr); gap: 1rem; margin: 1rem 0;">
-        <div class="stat-card">
-            <div class="stat-number">{total}</div>
-            <div class="stat-label">Total</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-number" style="background: linear-gradient(135deg, #059669, #10b981); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">{positive}</div>
-            <div class="stat-label">Positive</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-number" style="background: linear-gradient(135deg, #dc2626, #ef4444); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">{negative}</div>
-            <div class="stat-label">Negative</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-number" style="background: linear-gradient(135deg, #4b5563, #6b7280); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">{neutral}</div>
-            <div class="stat-label">Neutral</div>
-        </div>
-        <div class="stat-card">
-            <div class="stat-number">{validation_rate}%</div>
-            <div class="stat-label">Validated</div>
-        </div>
-    </div>
-    </div>
-    """
+def render_stats_html(stats: dict) -> str:
+    """Render statistics (from compute_stats) as HTML."""
+    total = stats["total"]
+    validation_rate = int((stats["validated"] / total) * 100) if total > 0 else 0
+    return STATS_PANEL_TEMPLATE % dict(stats, validation_rate=validation_rate)
 
 
-def render_pipeline_inspector(debug_data: dict):
+def render_pipeline_inspector(message_id: int, debug_data: dict):
     """Render the pipeline inspector with architecture and data."""
-    with st.expander("🔍 Pipeline Inspector (Under the Hood)", expanded=False):
+    # Nothing below is built or sent to the browser until the inspector is switched on
+    if not st.toggle("🔍 Pipeline Inspector (Under the Hood)", key=f"inspector_{message_id}"):
+        return
+    
+    with st.container(border=True):
         st.markdown("### 🧩 Pipeline Architecture")
         
         # Architecture Visualization
-        st.markdown("""
-        <div style="background: #0f0f0f; padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem; border: 1px solid rgba(139, 92, 246, 0.2);">
-            <div style="display: flex; justify-content: space-between; align-items: center; text-align: center; position: relative;">
-                <div style="flex: 1;">
-                    <div style="font-size: 2rem;">👤</div>
-                    <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">User Query</div>
-                    <div style="font-size: 0.7rem; color: #71717a; margin-top: 0.2rem;">"{debug_data.get('query', 'Topic')}"</div>
-                </div>
-                <div style="font-size: 1.5rem; color: #4b5563;">➜</div>
-                 <div style="flex: 1;">
-                    <div style="font-size: 2rem;">🌍</div>
-                    <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">NewsAPI</div>
-                     <div style="font-size: 0.7rem; color: #71717a; margin-top: 0.2rem;">{debug_data.get('articles_fetched', 0)} articles</div>
-                </div>
-                <div style="font-size: 1.5rem; color: #4b5563;">➜</div>
-                <div style="flex: 1; position: relative;">
-                    <div style="font-size: 2rem; filter: drop-shadow(0 0 10px rgba(139, 92, 246, 0.3));">🧠</div>
-                    <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">LLM #1<br>(GPT-4o)</div>
-                    <span style="position: absolute; top: -10px; right: 10px; background: #8b5cf6; color: white; font-size: 0.6rem; padding: 2px 6px; border-radius: 10px;">Analysis</span>
-                </div>
-                <div style="font-size: 1.5rem; color: #4b5563;">➜</div>
-                <div style="flex: 1; position: relative;">
-                    <div style="font-size: 2rem; filter: drop-shadow(0 0 10px rgba(16, 185, 129, 0.3));">🛡️</div>
-                    <div style="font-size: 0.8rem; color: #a1a1aa; margin-top: 0.5rem;">LLM #2<br>(Nemotron)</div>
-                     <span style="position: absolute; top: -10px; right: 10px; background: #10b981; color: white; font-size: 0.6rem; padding: 2px 6px; border-radius: 10px;">Validation</span>
-                </div>
-            </div>
-            <div style="margin-top: 1rem; text-align: center; font-size: 0.75rem; color: #52525b; font-style: italic;">
-                Double-Agent Verification Architecture
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(PIPELINE_DIAGRAM_TEMPLATE % {
+            "query": html.escape(debug_data.get("query", "Topic")),
+            "articles_fetched": debug_data.get("articles_fetched", 0),
+        })
         
-        # Data Inspection Tabs
-        tab1, tab2, tab3 = st.tabs(["📄 Raw Articles", "🧠 Agent 1 Output", "🛡️ Agent 2 Output"])
+        # Data inspection: only the selected view's JSON is sent (st.tabs would send all three)
+        view = st.radio(
+            "Inspect",
+            ["📄 Raw Articles", "🧠 Agent 1 Output", "🛡️ Agent 2 Output"],
+            horizontal=True,
+            label_visibility="collapsed",
+            key=f"inspector_view_{message_id}"
+        )
         
-        with tab1:
+        if view == "📄 Raw Articles":
             st.caption(f"Fetching top {debug_data.get('articles_fetched', 0)} articles")
             st.json(debug_data.get("articles_preview", []))
             
-        with tab2:
+        elif view == "🧠 Agent 1 Output":
             st.caption("Raw analysis from OpenAI GPT-4o-mini (Before Validation)")
             if debug_data.get("raw_analysis"):
                 st.json(debug_data.get("raw_analysis")[0] if isinstance(debug_data.get("raw_analysis"), list) and debug_data.get("raw_analysis") else {})
             else:
                 st.info("No analysis data available")
                 
-        with tab3:
+        else:
             st.caption("Validated output from OpenRouter/Nemotron (Final Result)")
             if debug_data.get("raw_validation"):
                 # showing first valid result
@@ -532,25 +315,50 @@ def render_pipeline_inspector(debug_data: dict):
             else:
                 st.info("No validation data available")
 
+# Leading command verbs stripped from chat prompts ("analyze news about ...")
+COMMAND_PREFIX_RE = re.compile(
+    r'^(analyze|fetch|find|show|search|summari[sz]e|fact[- ]?check)\b\s*(me)?\s*(news|articles?)?\s*(about|on|for)?\s*',
+    re.IGNORECASE
+)
+
+# First words that can start COMMAND_PREFIX_RE ("fact-check"/"fact check" start with "fact")
+COMMAND_VERBS = frozenset({"analyze", "fetch", "find", "show", "search", "summarize", "summarise", "fact", "factcheck"})
+FIRST_WORD_RE = re.compile(r'[a-z]+', re.IGNORECASE)
+# Article counts ("5 articles", "get 10") and the leading "get N articles about" form
+ARTICLE_COUNT_RE = re.compile(r'(\d+)\s*(articles?|news|stories)?', re.IGNORECASE)
+GET_PREFIX_RE = re.compile(r'^get\s+(\d+\s+)?(articles?|news)\s+(about|on|for)?', re.IGNORECASE)
+
+
+def _first_word(text: str) -> str:
+    """Lowercased leading run of letters ("" if the text doesn't start with one)."""
+    match = FIRST_WORD_RE.match(text)
+    return match.group().lower() if match else ""
+
+
 def parse_user_query(query: str) -> tuple[str, int]:
     """Parse user query to extract topic and number of articles."""
     # Default values
     topic = query.strip()
     num_articles = 10
     
-    # Check for number patterns like "5 articles", "get 10", etc.
-    num_match = re.search(r'(\d+)\s*(articles?|news|stories)?', query.lower())
-    if num_match:
-        num = int(num_match.group(1))
-        if 1 <= num <= 20:
-            num_articles = num
+    # Check for number patterns like "5 articles", "get 10", etc. (most prompts have no digits at all)
+    if any(ch.isdigit() for ch in topic):
+        num_match = ARTICLE_COUNT_RE.search(topic)
+        if num_match:
+            num = int(num_match.group(1))
+            if 1 <= num <= 20:
+                num_articles = num
+        
+        # Clean up the topic
+        topic = ARTICLE_COUNT_RE.sub('', topic).strip()
     
-    # Clean up the topic
-    topic = re.sub(r'\d+\s*(articles?|news|stories)?', '', topic, flags=re.IGNORECASE).strip()
-    topic = re.sub(r'^(analyze|fetch|find|show|search)\s*(me)?\s*(news|articles?)?\s*(about|on|for)?\s*', '', topic, flags=re.IGNORECASE).strip()
+    # Most prompts don't start with a command, so check the first word before running the regexes
+    if _first_word(topic) in COMMAND_VERBS:
+        topic = COMMAND_PREFIX_RE.sub('', topic).strip()
     
     # Don't strip "get" if it might be part of "get lucky" or similar, but "get 5 articles" is okay to strip
-    topic = re.sub(r'^get\s+(\d+\s+)?(articles?|news)\s+(about|on|for)?', '', topic, flags=re.IGNORECASE).strip()
+    if _first_word(topic) == "get":
+        topic = GET_PREFIX_RE.sub('', topic).strip()
     
     if not topic:
         topic = "India politics OR India government"
@@ -558,26 +366,81 @@ def parse_user_query(query: str) -> tuple[str, int]:
     return topic, num_articles
 
 
-def run_analysis(topic: str, num_articles: int, status_callback=None) -> tuple[list, str, dict]:
-    """Run the full analysis pipeline and return results with a summary message."""
+def _throttled(callback, min_interval: float):
+    """
+    Wrap callback so it runs at most once per min_interval seconds.
+    
+    Calls inside the interval are coalesced rather than dropped: the latest
+    arguments are kept and sent with the next call after the interval, and
+    wrapper.flush() sends any still-pending call immediately.
+    """
+    last_call = 0.0
+    pending = None
+    
+    def flush():
+        nonlocal last_call, pending
+        if pending is not None:
+            args, pending = pending, None
+            last_call = time.monotonic()
+            callback(*args)
+    
+    def wrapper(*args):
+        nonlocal pending
+        pending = args
+        if time.monotonic() - last_call >= min_interval:
+            flush()
+    
+    wrapper.flush = flush
+    return wrapper
+
+
+def run_analysis(topic: str, num_articles: int, status_callback=None, result_callback=None) -> tuple[list, str, dict]:
+    """
+    Run the full analysis pipeline and return results with a summary message.
+    
+    status_callback receives stage and progress labels; result_callback receives
+    lists of (index, result) pairs for newly validated articles while the rest are
+    still running, so the UI can show them early in article order. Both are called
+    together, about once per 10% of articles; progress labels are additionally
+    coalesced to one per STATUS_UPDATE_INTERVAL, with the last one always sent.
+    """
+    from news_fetcher import fetch_news, NewsFetcherError
+    from llm_analyzer import AnalyzerError
+    from llm_validator import ValidatorError
+    from pipeline import iter_pipeline, compute_stats
+    
     try:
         # Fetch news
         if status_callback: status_callback(f"🌍 Fetching top {num_articles} articles for '{topic}'...")
+        # Repeat queries and articles are served from the pipeline modules' own caches
+        # (fetch_news: 10 minutes; LLM results: on disk, shared with the Flask API)
         articles = fetch_news(query=topic, num_articles=num_articles)
         
-        # Analyze with LLM#1
-        if status_callback: status_callback("🧠 Analyzing content with GPT-4o-mini...")
-        analyses = analyze_articles(articles)
+        # Analyze with LLM#1 and validate with LLM#2. Both calls are network-bound,
+        # so articles run concurrently; each one is validated as soon as it is analyzed.
+        if status_callback: status_callback("🧠 Analyzing with GPT-4o-mini & validating with Nemotron...")
+        total = len(articles)
+        update_every = max(1, total // 10)  # Each UI update is a round-trip to the browser
+        validated_results = [None] * total
+        pending = []
+        # Stage labels above go straight through; cached batches can finish all at once,
+        # so per-article progress labels are coalesced
+        progress = _throttled(status_callback, STATUS_UPDATE_INTERVAL) if status_callback else None
+        for done, (index, result) in enumerate(iter_pipeline(articles), 1):
+            validated_results[index] = result
+            pending.append((index, result))
+            if done % update_every == 0 or done == total:
+                if result_callback: result_callback(pending)
+                if progress: progress(f"🧠 Analyzed & validated {done}/{total} articles...")
+                pending = []
+        if progress: progress.flush()
         
-        # Validate with LLM#2
-        if status_callback: status_callback("🛡️ Validating insights with Nemotron...")
-        validated_results = validate_analyses(articles, analyses)
+        # LLM#1 output before validation, for the pipeline inspector
+        analyses = [{k: v for k, v in r.items() if k != "validation"} for r in validated_results]
         
-        # Generate summary
-        total = len(validated_results)
-        positive = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "positive")
-        negative = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "negative")
-        neutral = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "neutral")
+        # Generate summary; the stats are returned too so the stats panel doesn't recount
+        stats = compute_stats(validated_results)
+        total, positive, negative, neutral = stats["total"], stats["positive"], stats["negative"], stats["neutral"]
         
         summary = f"I analyzed **{total} articles** about '{topic}'.\n\n"
         summary += f"**Sentiment breakdown:** {positive} positive, {negative} negative, {neutral} neutral.\n\n"
@@ -594,7 +457,8 @@ def run_analysis(topic: str, num_articles: int, status_callback=None) -> tuple[l
             "articles_fetched": len(articles),
             "articles_preview": [a.get("title") for a in articles[:3]],
             "raw_analysis": analyses,
-            "raw_validation": validated_results
+            "raw_validation": validated_results,
+            "stats": stats
         }
         
     except NewsFetcherError as e:
@@ -610,171 +474,127 @@ def run_analysis(topic: str, num_articles: int, status_callback=None) -> tuple[l
         return [], f"❌ Unexpected error: {e}", {}
 
 
-def main():
-    # Initialize session state
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    if "results" not in st.session_state:
-        st.session_state.results = {}
-    if "num_articles" not in st.session_state:
-        st.session_state.num_articles = 10
+def chat_message(role: str, content: str, **extra) -> dict:
+    """Build a chat history entry with its bubble HTML rendered once, up front."""
+    # Widgets are keyed on this id, not the list index, which shifts once old messages are evicted
+    message_id = st.session_state.next_message_id
+    st.session_state.next_message_id += 1
+    # Prompts, topics and API error text are all user- or network-controlled; markdown still renders
+    return {
+        "id": message_id,
+        "role": role,
+        "content": content,
+        "html": CHAT_BUBBLE_TEMPLATE % {"role": role, "avatar": CHAT_AVATARS[role], "content": html.escape(content)},
+        **extra
+    }
+
+
+def render_message(message: dict):
+    """Render one chat message and, for assistant turns, its analysis results."""
+    st.markdown(message["html"], unsafe_allow_html=True)
     
-    # Sidebar
-    with st.sidebar:
-        st.markdown("""
-        <div style="text-align: center; padding: 1rem 0;">
-            <h2 style="background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; margin-bottom: 0.5rem;">⚡ News Analyzer</h2>
-            <p style="color: #a1a1aa; font-size: 0.9rem;">Chat with AI about news</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("<div class='custom-divider'></div>", unsafe_allow_html=True)
-        
-        # Search configuration
-        st.markdown("### 🔧 Search Settings")
-        
-        # Category Selector
-        categories = ["General", "Politics", "Technology", "Business", "Entertainment", "Health", "Science", "Sports"]
-        st.session_state.category = st.selectbox(
-            "News Category",
-            options=categories,
-            index=0,
-            help="Filter news by category"
-        )
-        
-        st.session_state.num_articles = st.slider(
-            "Number of Articles",
-            min_value=5,
-            max_value=20,
-            value=st.session_state.num_articles,
-            help="How many articles to analyze per search"
-        )
-        
-        st.markdown("<div class='custom-divider'></div>", unsafe_allow_html=True)
-        
-        st.markdown("### 🎯 Quick Commands")
-        if st.button("🇮🇳 India Politics News", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "Analyze India politics news"})
-            st.session_state.trigger_analysis = True
-        
-        if st.button("💻 Tech Trends", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "Get 5 articles about technology"})
-            st.session_state.trigger_analysis = True
+    if message["role"] == "assistant":
+        # Show results if this message has associated results
+        results = message.get("results")
+        if results:
+            with st.expander(f"📋 View all {len(results)} articles", expanded=False):
+                # One element for all cards, rendered once when the turn was stored
+                st.markdown(message["cards_html"], unsafe_allow_html=True)
             
-        if st.button("💹 Stock Market", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "What's happening in the stock market?"})
-            st.session_state.trigger_analysis = True
+            # Download buttons
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="📥 Download JSON",
+                    data=message["json_bytes"],
+                    file_name=f"analysis_{message['timestamp']}.json",
+                    mime="application/json",
+                    use_container_width=True,
+                    key=f"json_{message['id']}"
+                )
+            with col2:
+                st.download_button(
+                    label="📄 Download Report",
+                    data=message["report_bytes"],
+                    file_name=f"report_{message['timestamp']}.md",
+                    mime="text/markdown",
+                    use_container_width=True,
+                    key=f"md_{message['id']}"
+                )
             
-        if st.button("🌍 Global Climate", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "Search for 15 articles on climate"})
+            # Pipeline Inspector
+            if message.get("debug"):
+                render_pipeline_inspector(message["id"], message["debug"])
+
+
+@st.fragment
+def render_sidebar():
+    """Sidebar settings and quick commands; widget changes rerun only this fragment."""
+    st.html(SIDEBAR_HEADER)
+    
+    st.html("<div class='custom-divider'></div>")
+    
+    # Search configuration
+    st.markdown("### 🔧 Search Settings")
+    
+    # Category Selector
+    st.session_state.category = st.selectbox(
+        "News Category",
+        options=CATEGORIES,
+        index=0,
+        help="Filter news by category"
+    )
+    
+    st.session_state.num_articles = st.slider(
+        "Number of Articles",
+        min_value=5,
+        max_value=20,
+        value=st.session_state.num_articles,
+        help="How many articles to analyze per search"
+    )
+    
+    st.html("<div class='custom-divider'></div>")
+    
+    st.markdown("### 🎯 Quick Commands")
+    # Quick commands rerun the whole app so the chat fragment picks up the trigger
+    for label, prompt in QUICK_COMMANDS:
+        if st.button(label, use_container_width=True):
+            st.session_state.messages.append(chat_message("user", prompt))
             st.session_state.trigger_analysis = True
-        
-        st.markdown("<div class='custom-divider'></div>", unsafe_allow_html=True)
-        
-        if st.button("🗑️ Clear Chat", use_container_width=True):
-            st.session_state.messages = []
-            st.session_state.results = {}
             st.rerun()
-        
-        st.markdown("<div class='custom-divider'></div>", unsafe_allow_html=True)
-        
-        st.markdown("### ℹ️ How it works")
-        st.markdown("""
-        <div style="color: #a1a1aa; font-size: 0.85rem; line-height: 1.6;">
-        1️⃣ <strong>You ask</strong> about any news topic<br><br>
-        2️⃣ <strong>GPT-4o-mini</strong> analyzes the articles<br><br>
-        3️⃣ <strong>Nemotron</strong> validates the analysis<br><br>
-        4️⃣ <strong>You get</strong> sentiment & insights
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("<div class='custom-divider'></div>", unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div style="text-align: center; color: #71717a; font-size: 0.8rem;">
-            Built by <a href="https://cv.vivekmind.com" target="_blank" style="color: #8b5cf6;">Vivek</a>
-        </div>
-        """, unsafe_allow_html=True)
     
-    # Main content header
-    st.markdown("""
-    <div style="text-align: center; padding: 1rem 0 2rem 0;">
-        <h1 style="font-size: 2.2rem; background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 50%, #10b981 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">📰 News Analyzer AI</h1>
-        <p style="color: #a1a1aa;">Ask me about any news topic and I'll analyze it for you</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html("<div class='custom-divider'></div>")
     
+    if st.button("🗑️ Clear Chat", use_container_width=True):
+        st.session_state.messages.clear()
+        st.rerun()
+    
+    if st.button("♻️ Clear Cache", use_container_width=True, help="Forget cached analyses and re-run the LLMs"):
+        from news_fetcher import clear_fetch_cache
+        from llm_analyzer import clear_analysis_cache
+        from llm_validator import clear_validation_cache
+        clear_fetch_cache()
+        clear_analysis_cache()
+        clear_validation_cache()
+    
+    # Static footer: one element instead of five
+    st.markdown(SIDEBAR_FOOTER, unsafe_allow_html=True)
+
+@st.fragment
+def render_chat():
+    """Chat history and input; a submitted prompt reruns only this fragment."""
     # Display chat messages
     if not st.session_state.messages:
         # Show welcome message
-        st.markdown("""
-        <div class="welcome-box">
-            <h2>👋 Hi! I'm your News Analyzer</h2>
-            <p style="color: #a1a1aa; max-width: 500px; margin: 0 auto;">
-                Ask me to analyze news on any topic. I use <strong>dual AI validation</strong> to give you accurate sentiment analysis.
-            </p>
-            <div class="example-queries">
-                <div class="example-query">🇮🇳 "Analyze India politics news"</div>
-                <div class="example-query">💹 "Get stock market updates"</div>
-                <div class="example-query">🌍 "What's happening globally?"</div>
-                <div class="example-query">💻 "5 articles about AI technology"</div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(WELCOME_HTML)
     else:
-        # Display chat history
-        for i, message in enumerate(st.session_state.messages):
-            if message["role"] == "user":
-                st.markdown(f"""
-                <div class="chat-message user">
-                    <div class="avatar">👤</div>
-                    <div class="content"><p>{message["content"]}</p></div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="chat-message assistant">
-                    <div class="avatar">🤖</div>
-                    <div class="content"><p>{message["content"]}</p></div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Show results if this message has associated results
-                if f"results_{i}" in st.session_state.results:
-                    results = st.session_state.results[f"results_{i}"]
-                    if results:
-                        st.markdown(render_stats_html(results), unsafe_allow_html=True)
-                        
-                        with st.expander(f"📋 View all {len(results)} articles", expanded=False):
-                            for j, result in enumerate(results):
-                                st.markdown(render_article_card(result, j), unsafe_allow_html=True)
-                        
-                        # Download buttons
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            json_data = json.dumps(results, indent=2, ensure_ascii=False)
-                            st.download_button(
-                                label="📥 Download JSON",
-                                data=json_data,
-                                file_name=f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                                mime="application/json",
-                                use_container_width=True,
-                                key=f"json_{i}"
-                            )
-                        with col2:
-                            md_report = generate_markdown_report(results)
-                            st.download_button(
-                                label="📄 Download Report",
-                                data=md_report,
-                                file_name=f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                                mime="text/markdown",
-                                use_container_width=True,
-                                key=f"md_{i}"
-                            )
-                        
-                        # Pipeline Inspector
-                        if f"debug_{i}" in st.session_state.results:
-                            render_pipeline_inspector(st.session_state.results[f"debug_{i}"])
+        # Display chat history; only the latest turns are rendered by default
+        messages = st.session_state.messages
+        hidden = max(0, len(messages) - MAX_VISIBLE_MESSAGES)
+        show_older = hidden and st.toggle(f"Show {hidden} older messages", key="show_older_messages")
+        for i, message in enumerate(messages):
+            if show_older or i >= hidden:
+                render_message(message)
     
     # Handle triggered analysis from buttons OR chat input
     trigger = False
@@ -787,7 +607,7 @@ def main():
         trigger = True
     elif user_input := st.chat_input("Ask me about any news topic..."):
         prompt = user_input
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.messages.append(chat_message("user", prompt))
         trigger = True
         
     if trigger and prompt:
@@ -804,47 +624,92 @@ def main():
         
         # Show processing message with detailed status
         with st.status("🚀 Starting News Analysis...", expanded=True) as status:
-            results, summary, debug_data = run_analysis(search_topic, num_articles, status_callback=lambda msg: status.update(label=msg))
+            # Cards stream in here as articles finish; the full turn renders after the rerun.
+            # Each article gets its own slot, so cards keep article order whatever finishes first.
+            live_cards = st.container()
+            slots = []
+            
+            def show_cards(batch):
+                for j, result in batch:
+                    while len(slots) <= j:
+                        slots.append(live_cards.empty())
+                    slots[j].markdown(render_article_card(result, j), unsafe_allow_html=True)
+            
+            results, summary, debug_data = run_analysis(
+                search_topic,
+                num_articles,
+                status_callback=lambda msg: status.update(label=msg),
+                result_callback=show_cards
+            )
             status.update(label="✅ Analysis Complete!", state="complete", expanded=False)
         
-        # Add assistant response
-        message_index = len(st.session_state.messages)
-        st.session_state.messages.append({"role": "assistant", "content": summary})
-        
-        # Store results
+        # Add assistant response, with its results attached so they are evicted together
+        message = chat_message("assistant", summary)
         if results:
-            st.session_state.results[f"results_{message_index}"] = results
-            st.session_state.results[f"debug_{message_index}"] = debug_data
+            # The stats panel goes out in the same element as the bubble
+            message["html"] += render_stats_html(debug_data["stats"]).strip()
+            message.update(
+                results=results,
+                cards_html="".join(render_article_card(result, j) for j, result in enumerate(results)),
+                # Download payloads are serialized once here, not on every rerun
+                json_bytes=json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8"),
+                report_bytes=generate_markdown_report(results, debug_data["stats"]).encode("utf-8"),
+                timestamp=datetime.now().strftime('%Y%m%d_%H%M%S'),
+                debug=debug_data
+            )
+        st.session_state.messages.append(message)
         
         st.rerun()
 
 
-def generate_markdown_report(results: list) -> str:
-    """Generate markdown report from results."""
-    total = len(results)
-    positive = sum(1 for r in results if r.get("analysis", {}).get("sentiment") == "positive")
-    negative = sum(1 for r in results if r.get("analysis", {}).get("sentiment") == "negative")
-    neutral = sum(1 for r in results if r.get("analysis", {}).get("sentiment") == "neutral")
-    validated = sum(1 for r in results if r.get("validation", {}).get("is_valid", False))
-    
-    lines = [
-        "# News Analysis Report",
-        "",
-        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        f"**Total Articles:** {total}",
-        "",
-        "## Summary",
-        "",
-        f"- Positive: {positive}",
-        f"- Negative: {negative}",
-        f"- Neutral: {neutral}",
-        f"- Validation Rate: {validated}/{total}",
-        "",
-        "---",
-        "",
-        "## Articles",
-        ""
-    ]
+def main():
+    # Custom CSS for ChatGPT-style dark theme
+    st.markdown(_load_css(), unsafe_allow_html=True)
+    
+    # Initialize session state
+    if "messages" not in st.session_state:
+        st.session_state.messages = deque(maxlen=MAX_MESSAGES)
+    if "next_message_id" not in st.session_state:
+        st.session_state.next_message_id = 0
+    if "num_articles" not in st.session_state:
+        st.session_state.num_articles = 10
+    
+    with st.sidebar:
+        render_sidebar()
+    
+    # Main content header
+    st.html(PAGE_HEADER)
+    
+    render_chat()
+
+
+def generate_markdown_report(results: list, stats: dict = None) -> str:
+    """Generate markdown report from results (stats from compute_stats, computed if not given)."""
+    if stats is None:
+        from pipeline import compute_stats
+        stats = compute_stats(results)
+    total = stats["total"]
+    positive, negative, neutral, validated = stats["positive"], stats["negative"], stats["neutral"], stats["validated"]
+    
+    buf = io.StringIO()
+    write = buf.write
+    write(
+        "# News Analysis Report\n"
+        "\n"
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"**Total Articles:** {total}\n"
+        "\n"
+        "## Summary\n"
+        "\n"
+        f"- Positive: {positive}\n"
+        f"- Negative: {negative}\n"
+        f"- Neutral: {neutral}\n"
+        f"- Validation Rate: {validated}/{total}\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Articles\n"
+    )
     
     for i, result in enumerate(results, 1):
         title = result.get("title", "Unknown")
@@ -852,20 +717,20 @@ def generate_markdown_report(results: list) -> str:
         analysis = result.get("analysis", {})
         validation = result.get("validation", {})
         
-        lines.extend([
-            f"### {i}. {title}",
-            "",
-            f"**Source:** [{result.get('source', 'Unknown')}]({url})",
-            f"**Gist:** {analysis.get('gist', 'N/A')}",
-            f"**Sentiment:** {analysis.get('sentiment', 'N/A').capitalize()}",
-            f"**Tone:** {analysis.get('tone', 'N/A').capitalize()}",
-            f"**Validated:** {'✓' if validation.get('is_valid') else '✗'} - {validation.get('validation_notes', 'N/A')[:100]}",
-            "",
-            "---",
-            ""
-        ])
-    
-    return "\n".join(lines)
+        write(
+            "\n"
+            f"### {i}. {title}\n"
+            "\n"
+            f"**Source:** [{result.get('source', 'Unknown')}]({url})\n"
+            f"**Gist:** {analysis.get('gist', 'N/A')}\n"
+            f"**Sentiment:** {analysis.get('sentiment', 'N/A').capitalize()}\n"
+            f"**Tone:** {analysis.get('tone', 'N/A').capitalize()}\n"
+            f"**Validated:** {'✓' if validation.get('is_valid') else '✗'} - {validation.get('validation_notes', 'N/A')[:100]}\n"
+            "\n"
+            "---\n"
+        )
+    
+    return buf.getvalue()
 
 
 if __name__ == "__main__":
@@ -4,19 +4,78 @@ Uses OpenAI to analyze news articles for gist, sentiment, and tone.
 """
 
 import os
+import re
 import json
-import time
+import hashlib
+from functools import lru_cache
 from typing import Dict, Optional
 from dotenv import load_dotenv
 
+from prompts import get_prompt_text
+from rate_limiter import limiter_from_env
+from response_cache import ResponseCache
+
 load_dotenv()
 
 
+# Seconds to wait for a completion (the SDK default is 10 minutes)
+LLM_TIMEOUT = 30.0
+
+# Requests per minute allowed by the OpenAI account tier (OPENAI_RPM, 0 disables)
+_rate_limiter = limiter_from_env("OPENAI_RPM", 500)
+
+# Analyses keyed on normalized article content, kept across restarts in output/analysis_cache.json
+ANALYSIS_CACHE_SIZE = 1024
+_analysis_cache = ResponseCache("analysis_cache.json", maxsize=ANALYSIS_CACHE_SIZE)
+
+# Completion budgets; the schema's JSON object needs ~80 tokens, so a tight cap stops run-on
+# output early. A reply cut off at the cap is re-asked once with the larger budget.
+ANALYSIS_MAX_TOKENS = 120
+ANALYSIS_RETRY_MAX_TOKENS = 400
+
+# Field rules live in the schema below, so the system prompt only states the task
+ANALYSIS_SYSTEM_PROMPT = "You are a news analyst. Summarize the article's main point in 1-2 sentences and classify its sentiment and tone."
+
+# Allowed labels, enforced by the structured-output schema below (sorted there, so the
+# request is byte-identical across runs despite set ordering); tests check against them too
+VALID_SENTIMENTS = frozenset({"positive", "negative", "neutral"})
+VALID_TONES = frozenset({"urgent", "analytical", "satirical", "balanced", "critical", "optimistic", "pessimistic", "informative"})
+
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "article_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "gist": {"type": "string", "description": "1-2 sentence summary of the main point"},
+                "sentiment": {"type": "string", "enum": sorted(VALID_SENTIMENTS)},
+                "tone": {"type": "string", "enum": sorted(VALID_TONES)},
+            },
+            "required": ["gist", "sentiment", "tone"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# NewsAPI truncation marker ("... [+2345 chars]") and anything that isn't a letter or digit
+_TRUNCATION_RE = re.compile(r"\[\+\d+ chars\]")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
 class AnalyzerError(Exception):
     """Custom exception for analyzer errors."""
     pass
 
 
+@lru_cache(maxsize=1)
+def _build_client(api_key: str):
+    """Create the OpenAI client once per key so its keep-alive connection pool is reused."""
+    from openai import OpenAI, Timeout
+    return OpenAI(api_key=api_key, max_retries=3, timeout=Timeout(LLM_TIMEOUT, connect=5.0))
+
+
 def get_openai_client():
     """Initialize and return OpenAI client."""
     api_key = os.getenv("OPENAI_API_KEY")
@@ -24,19 +83,36 @@ def get_openai_client():
         raise AnalyzerError("OPENAI_API_KEY not configured in .env file")
     
     try:
-        from openai import OpenAI
-        return OpenAI(api_key=api_key)
+        return _build_client(api_key)
     except ImportError:
         raise AnalyzerError("openai package not installed. Run: pip install openai")
 
 
+def content_fingerprint(article: Dict) -> str:
+    """
+    Fingerprint an article's title and content, ignoring case, punctuation and spacing.
+    
+    Wire-service reposts and syndicated copies usually differ only in those details
+    (or in NewsAPI's truncation marker), so they share a fingerprint.
+    
+    Args:
+        article: Article dictionary
+        
+    Returns:
+        Hex digest identifying the article text
+    """
+    text = f"{article.get('title') or ''} {article.get('content') or ''}"
+    normalized = " ".join(_NON_WORD_RE.sub(" ", _TRUNCATION_RE.sub("", text).lower()).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
 def analyze_article(article: Dict, max_retries: int = 3) -> Dict:
     """
     Analyze a single article using OpenAI.
     
     Args:
         article: Article dictionary with title, description, content
-        max_retries: Number of retries for transient failures
+        max_retries: Number of SDK retries for transient network/API failures
         
     Returns:
         Analysis dictionary with gist, sentiment, tone
@@ -44,136 +120,94 @@ def analyze_article(article: Dict, max_retries: int = 3) -> Dict:
     Raises:
         AnalyzerError: If analysis fails after all retries
     """
+    # Near-duplicate articles reuse an earlier analysis instead of another OpenAI call
+    key = content_fingerprint(article)
+    cached = _analysis_cache.get(key)
+    if cached is not None:
+        return cached
+    
     client = get_openai_client()
     
     # Build article text for analysis
-    article_text = f"""
-Title: {article.get('title', 'No title')}
-Source: {article.get('source', 'Unknown')}
-Description: {article.get('description', 'No description')}
-Content: {article.get('content', 'No content')}
-    """.strip()
+    article_text = get_prompt_text(article)
     
-    prompt = f"""Analyze the following news article and provide your analysis in JSON format.
-
-Article:
-{article_text}
+    prompt = f"{article_text}\n\nReturn JSON matching the schema."
 
-Provide your analysis as a valid JSON object with exactly these fields:
-- "gist": A 1-2 sentence summary of the main point of the news
-- "sentiment": One of "positive", "negative", or "neutral"
-- "tone": One of "urgent", "analytical", "satirical", "balanced", "critical", "optimistic", "pessimistic", or "informative"
-
-Return ONLY the JSON object, no additional text or markdown formatting.
-
-Example format:
-{{"gist": "Summary here", "sentiment": "neutral", "tone": "analytical"}}
-"""
-
-    last_error = None
-    for attempt in range(max_retries):
+    # Connection errors, timeouts, 429s and 5xx are retried inside the SDK, which
+    # honors the provider's Retry-After header; only a truncated reply is re-asked here
+    for max_tokens in (ANALYSIS_MAX_TOKENS, ANALYSIS_RETRY_MAX_TOKENS):
+        _rate_limiter.acquire()
         try:
-            response = client.chat.completions.create(
+            response = client.with_options(max_retries=max_retries).chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are a news analyst. Respond only with valid JSON."},
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=max_tokens,
+                response_format=ANALYSIS_RESPONSE_FORMAT
             )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```"):
-                lines = response_text.split("\n")
-                # Remove first and last lines (```json and ```)
-                response_text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
-            
-            # Parse JSON
-            analysis = json.loads(response_text)
-            
-            # Validate required fields
-            required_fields = ["gist", "sentiment", "tone"]
-            for field in required_fields:
-                if field not in analysis:
-                    raise AnalyzerError(f"Missing required field: {field}")
-            
-            # Normalize sentiment
-            sentiment = analysis["sentiment"].lower().strip()
-            if sentiment not in ["positive", "negative", "neutral"]:
-                sentiment = "neutral"  # Default to neutral if unclear
-            analysis["sentiment"] = sentiment
-            
-            # Normalize tone
-            valid_tones = ["urgent", "analytical", "satirical", "balanced", 
-                         "critical", "optimistic", "pessimistic", "informative"]
-            tone = analysis["tone"].lower().strip()
-            if tone not in valid_tones:
-                tone = "informative"  # Default
-            analysis["tone"] = tone
-            
-            return analysis
-            
-        except json.JSONDecodeError as e:
-            last_error = AnalyzerError(f"Failed to parse OpenAI response as JSON: {e}")
         except Exception as e:
-            last_error = AnalyzerError(f"OpenAI API error: {e}")
-        
-        # Wait before retry (exponential backoff)
-        if attempt < max_retries - 1:
-            time.sleep(2 ** attempt)
+            raise AnalyzerError(f"OpenAI API error: {e}")
+        if response.choices[0].finish_reason != "length":
+            break
+    else:
+        raise AnalyzerError(f"OpenAI response was cut off at {ANALYSIS_RETRY_MAX_TOKENS} tokens")
+    
+    # Structured outputs guarantee schema-conformant JSON (enums included), so no
+    # fence stripping or field normalization is needed; only refusals lack content
+    message = response.choices[0].message
+    if getattr(message, "refusal", None):
+        raise AnalyzerError(f"OpenAI refused to analyze the article: {message.refusal}")
+    try:
+        analysis = json.loads(message.content)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise AnalyzerError(f"Failed to parse OpenAI response as JSON: {e}")
+    
+    _analysis_cache.set(key, analysis)
     
-    raise last_error or AnalyzerError("Analysis failed after all retries")
+    return analysis
 
 
-def analyze_articles(articles: list) -> list:
+def clear_analysis_cache():
+    """Forget cached analyses, so the next run asks OpenAI again."""
+    _analysis_cache.clear()
+
+
+def build_result(article: Dict, index: int, analysis: Optional[Dict] = None, error: Optional[str] = None) -> Dict:
     """
-    Analyze multiple articles.
+    Wrap an analysis with the article info used by the validator and reports.
     
     Args:
-        articles: List of article dictionaries
+        article: Article dictionary
+        index: Position of the article in its batch (fallback ID)
+        analysis: Analysis from analyze_article, or None if it failed
+        error: Error message if the analysis failed
         
     Returns:
-        List of analysis results with article info and analysis
+        Result dictionary with article info, analysis and status
     """
-    results = []
+    result = {
+        "article_id": article.get("id", index + 1),
+        "title": article.get("title", ""),
+        "url": article.get("url", ""),
+        "source": article.get("source", "Unknown"),
+    }
     
-    for i, article in enumerate(articles):
-        print(f"Analyzing article {i + 1}/{len(articles)}: {article.get('title', 'Unknown')[:50]}...")
-        
-        try:
-            analysis = analyze_article(article)
-            result = {
-                "article_id": article.get("id", i + 1),
-                "title": article.get("title", ""),
-                "url": article.get("url", ""),
-                "source": article.get("source", "Unknown"),
-                "analysis": analysis,
-                "status": "success"
-            }
-        except AnalyzerError as e:
-            result = {
-                "article_id": article.get("id", i + 1),
-                "title": article.get("title", ""),
-                "url": article.get("url", ""),
-                "source": article.get("source", "Unknown"),
-                "analysis": {
-                    "gist": "Analysis failed",
-                    "sentiment": "neutral",
-                    "tone": "informative"
-                },
-                "status": "error",
-                "error": str(e)
-            }
-        
-        results.append(result)
-        
-        # Rate limiting - avoid hitting API limits
-        time.sleep(1)
+    if error is None:
+        result["analysis"] = analysis
+        result["status"] = "success"
+    else:
+        result["analysis"] = {
+            "gist": "Analysis failed",
+            "sentiment": "neutral",
+            "tone": "informative"
+        }
+        result["status"] = "error"
+        result["error"] = error
     
-    return results
+    return result
 
 
 if __name__ == "__main__":
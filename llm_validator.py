@@ -5,18 +5,52 @@ Uses OpenRouter (Qwen) to validate analysis from Gemini.
 
 import os
 import json
-import time
+import hashlib
+from functools import lru_cache
 from typing import Dict, Optional
 from dotenv import load_dotenv
 
+from prompts import get_prompt_text
+from rate_limiter import limiter_from_env
+from response_cache import ResponseCache
+
 load_dotenv()
 
 
+# Seconds to wait for a completion (the SDK default is 10 minutes)
+LLM_TIMEOUT = 30.0
+
+# Requests per minute allowed on OpenRouter; free models are capped at 20 (OPENROUTER_RPM, 0 disables)
+_rate_limiter = limiter_from_env("OPENROUTER_RPM", 20)
+
+# Completion budget; a verdict with short notes and corrections fits well within this
+VALIDATION_MAX_TOKENS = 250
+
+# Attempts per validation, in case the free model replies with malformed JSON
+JSON_ATTEMPTS = 2
+
+# Validations keyed on article text + the analysis checked, kept across restarts in output/validation_cache.json
+VALIDATION_CACHE_SIZE = 1024
+_validation_cache = ResponseCache("validation_cache.json", maxsize=VALIDATION_CACHE_SIZE)
+
+
 class ValidatorError(Exception):
     """Custom exception for validator errors."""
     pass
 
 
+@lru_cache(maxsize=1)
+def _build_client(api_key: str):
+    """Create the OpenRouter client once per key so its keep-alive connection pool is reused."""
+    from openai import OpenAI, Timeout
+    return OpenAI(
+        api_key=api_key,
+        base_url="https://openrouter.ai/api/v1",
+        max_retries=3,
+        timeout=Timeout(LLM_TIMEOUT, connect=5.0)
+    )
+
+
 def get_openrouter_client():
     """Initialize and return OpenRouter client (OpenAI-compatible)."""
     api_key = os.getenv("OPENROUTER_API_KEY")
@@ -24,11 +58,7 @@ def get_openrouter_client():
         raise ValidatorError("OPENROUTER_API_KEY not configured in .env file")
     
     try:
-        from openai import OpenAI
-        return OpenAI(
-            api_key=api_key,
-            base_url="https://openrouter.ai/api/v1"
-        )
+        return _build_client(api_key)
     except ImportError:
         raise ValidatorError("openai package not installed. Run: pip install openai")
 
@@ -40,7 +70,7 @@ def validate_analysis(article: Dict, analysis: Dict, max_retries: int = 3) -> Di
     Args:
         article: Original article dictionary
         analysis: Gemini's analysis (gist, sentiment, tone)
-        max_retries: Number of retries for transient failures
+        max_retries: Number of SDK retries for transient network/API failures
         
     Returns:
         Validation dictionary with is_valid, validation_notes, suggested_corrections
@@ -48,15 +78,18 @@ def validate_analysis(article: Dict, analysis: Dict, max_retries: int = 3) -> Di
     Raises:
         ValidatorError: If validation fails after all retries
     """
+    # An identical article + analysis pair was already checked; skip the OpenRouter call
+    key = hashlib.sha256(json.dumps(
+        [article.get("title"), article.get("content"), analysis], sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")).hexdigest()
+    cached = _validation_cache.get(key)
+    if cached is not None:
+        return cached
+    
     client = get_openrouter_client()
     
     # Build article text
-    article_text = f"""
-Title: {article.get('title', 'No title')}
-Source: {article.get('source', 'Unknown')}
-Description: {article.get('description', 'No description')}
-Content: {article.get('content', 'No content')}
-    """.strip()
+    article_text = get_prompt_text(article)
     
     # Build analysis text
     analysis_text = f"""
@@ -80,114 +113,97 @@ Your task:
 
 Respond with a JSON object containing:
 - "is_valid": boolean - true if the analysis is accurate, false if there are significant errors
-- "validation_notes": string - Brief explanation of your assessment, mention what's correct and any issues found
+- "validation_notes": string - 1-2 sentences on what's correct and any issues found
 - "suggested_corrections": null if valid, or an object with corrected values for any wrong fields
 
-Return ONLY the JSON object, no additional text.
-
-Example valid response:
-{{"is_valid": true, "validation_notes": "Gist accurately captures the policy announcement. Sentiment correctly identified as positive based on words like 'launched' and 'new initiative'.", "suggested_corrections": null}}
-
-Example invalid response:
-{{"is_valid": false, "validation_notes": "Sentiment should be negative as the article discusses failures and criticism.", "suggested_corrections": {{"sentiment": "negative"}}}}
+Example: {{"is_valid": false, "validation_notes": "Sentiment should be negative as the article discusses failures.", "suggested_corrections": {{"sentiment": "negative"}}}}
 """
 
+    # Connection errors, timeouts, 429s and 5xx are retried inside the SDK, which honors
+    # the provider's Retry-After header; only malformed JSON from the model is re-asked here
     last_error = None
-    for attempt in range(max_retries):
+    for attempt in range(JSON_ATTEMPTS):
+        _rate_limiter.acquire()
         try:
-            response = client.chat.completions.create(
+            response = client.with_options(max_retries=max_retries).chat.completions.create(
                 model="nvidia/nemotron-3-nano-30b-a3b:free",
                 messages=[
                     {"role": "system", "content": "You are a precise fact-checker. Respond only with valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=VALIDATION_MAX_TOKENS
             )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```"):
-                lines = response_text.split("\n")
-                response_text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
-            
-            # Parse JSON
+            response_text = (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            raise ValidatorError(f"OpenAI API error: {e}")
+        
+        # Remove markdown code blocks if present
+        if response_text.startswith("```"):
+            lines = response_text.split("\n")
+            response_text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
+        
+        # Parse JSON
+        try:
             validation = json.loads(response_text)
-            
-            # Validate required fields
-            if "is_valid" not in validation:
-                validation["is_valid"] = True
-            if "validation_notes" not in validation:
-                validation["validation_notes"] = "Validation completed"
-            if "suggested_corrections" not in validation:
-                validation["suggested_corrections"] = None
-            
-            return validation
-            
         except json.JSONDecodeError as e:
             last_error = ValidatorError(f"Failed to parse OpenAI response as JSON: {e}")
-        except Exception as e:
-            last_error = ValidatorError(f"OpenAI API error: {e}")
+            continue
+        if not isinstance(validation, dict):
+            last_error = ValidatorError(f"Expected a JSON object from OpenAI, got {type(validation).__name__}")
+            continue
+        
+        # Validate required fields
+        if "is_valid" not in validation:
+            validation["is_valid"] = True
+        if "validation_notes" not in validation:
+            validation["validation_notes"] = "Validation completed"
+        if "suggested_corrections" not in validation:
+            validation["suggested_corrections"] = None
         
-        # Wait before retry
-        if attempt < max_retries - 1:
-            time.sleep(2 ** attempt)
+        _validation_cache.set(key, validation)
+        return validation
     
     raise last_error or ValidatorError("Validation failed after all retries")
 
 
-def validate_analyses(articles: list, analyses: list) -> list:
+def clear_validation_cache():
+    """Forget cached validations, so the next run asks OpenRouter again."""
+    _validation_cache.clear()
+
+
+def validate_result(article: Dict, analysis_result: Dict) -> Dict:
     """
-    Validate multiple analyses.
+    Validate one analysis result, turning failures into a validation note.
     
     Args:
-        articles: List of original article dictionaries
-        analyses: List of analysis results from Gemini
+        article: Original article dictionary
+        analysis_result: Analysis result from build_result
         
     Returns:
-        List of validated results with validation info added
+        Copy of the analysis result with validation info added
     """
-    validated_results = []
+    validated_result = analysis_result.copy()
     
-    # Create a lookup for articles by ID
-    articles_lookup = {a.get("id", i + 1): a for i, a in enumerate(articles)}
+    # Skip if original analysis failed
+    if analysis_result.get("status") == "error":
+        validated_result["validation"] = {
+            "is_valid": False,
+            "validation_notes": "Skipped - original analysis failed",
+            "suggested_corrections": None
+        }
+        return validated_result
     
-    for i, analysis_result in enumerate(analyses):
-        article_id = analysis_result.get("article_id", i + 1)
-        article = articles_lookup.get(article_id, {})
-        
-        print(f"Validating analysis {i + 1}/{len(analyses)}: {analysis_result.get('title', 'Unknown')[:50]}...")
-        
-        # Skip if original analysis failed
-        if analysis_result.get("status") == "error":
-            validated_result = analysis_result.copy()
-            validated_result["validation"] = {
-                "is_valid": False,
-                "validation_notes": "Skipped - original analysis failed",
-                "suggested_corrections": None
-            }
-            validated_results.append(validated_result)
-            continue
-        
-        try:
-            validation = validate_analysis(article, analysis_result.get("analysis", {}))
-            validated_result = analysis_result.copy()
-            validated_result["validation"] = validation
-        except ValidatorError as e:
-            validated_result = analysis_result.copy()
-            validated_result["validation"] = {
-                "is_valid": True,  # Assume valid if we can't check
-                "validation_notes": f"Validation error: {e}",
-                "suggested_corrections": None
-            }
-        
-        validated_results.append(validated_result)
-        
-        # Rate limiting
-        time.sleep(1)
+    try:
+        validated_result["validation"] = validate_analysis(article, analysis_result.get("analysis", {}))
+    except ValidatorError as e:
+        validated_result["validation"] = {
+            "is_valid": True,  # Assume valid if we can't check
+            "validation_notes": f"Validation error: {e}",
+            "suggested_corrections": None
+        }
     
-    return validated_results
+    return validated_result
 
 
 if __name__ == "__main__":
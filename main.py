@@ -5,114 +5,193 @@ Main entry point that orchestrates the news analysis pipeline.
 
 import os
 import json
+import logging
+import logging.handlers
+import queue
+import atexit
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, jsonify, request, send_file
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster JSON output files
+except ImportError:
+    orjson = None
+
 from news_fetcher import fetch_news, NewsFetcherError, get_article_text
-from llm_analyzer import analyze_articles, AnalyzerError
-from llm_validator import validate_analyses, ValidatorError
+from pipeline import run_pipeline, compute_stats
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
 app = Flask(__name__)
 
 # Ensure output directory exists
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Concurrent HTTP requests handled by the waitress server
+SERVER_THREADS = 16
+
+def configure_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue so stdout writes happen on a background thread.
+    
+    QueueHandler still formats each message on the logging thread (so mutable
+    arguments are captured as they were); only the console handler's I/O moves.
+    
+    Args:
+        level: Minimum level for the root logger
+        
+    Returns:
+        The started QueueListener; call stop() on shutdown to flush pending records
+    """
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    return listener
+
+
+# `python main.py`, `flask run`, WSGI servers and Vercel (main:app) all import this module;
+# set up logging here unless the host already has, so pipeline progress stays visible
+if not logging.getLogger().handlers:
+    atexit.register(configure_logging().stop)
+
+# Background writer for output JSON files so /analyze responds without waiting on disk.
+# Registered after the log listener, so atexit drains it first and its log lines still get out.
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="save_json")
+atexit.register(_io_pool.shutdown, wait=True)
+
 
 def save_json(data: dict | list, filename: str) -> str:
     """Save data to JSON file in output directory."""
     filepath = os.path.join(OUTPUT_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Serialize to one UTF-8 blob up front; orjson is much faster when installed
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    # Write to a temp file and swap it in, so /results never reads a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=OUTPUT_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    log.info("Saved %s", os.path.relpath(filepath, os.path.dirname(OUTPUT_DIR)))
     return filepath
 
 
-def generate_markdown_report(validated_results: list, raw_articles: list) -> str:
+def save_json_in_background(data: dict | list, filename: str) -> Future:
+    """Queue save_json on the I/O pool; failures are logged since nobody waits on the result."""
+    def log_failure(future: Future):
+        if future.exception() is not None:
+            log.error("Failed to save %s", filename, exc_info=future.exception())
+    
+    future = _io_pool.submit(save_json, data, filename)
+    future.add_done_callback(log_failure)
+    return future
+
+
+def generate_markdown_report(validated_results: list, raw_articles: list, stats: dict = None) -> str:
     """
     Generate a human-readable Markdown report.
     
     Args:
         validated_results: List of validated analysis results
         raw_articles: Original raw articles
+        stats: Counts from compute_stats, computed here if not given
         
     Returns:
         Path to the generated report file
     """
     # Calculate statistics
-    total = len(validated_results)
-    positive = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "positive")
-    negative = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "negative")
-    neutral = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "neutral")
+    if stats is None:
+        stats = compute_stats(validated_results)
+    total = stats["total"]
+    positive, negative, neutral = stats["positive"], stats["negative"], stats["neutral"]
+    validated_count = stats["validated"]
     
-    validated_count = sum(1 for r in validated_results if r.get("validation", {}).get("is_valid", False))
-    
-    # Build report
-    report_lines = [
-        "# News Analysis Report",
-        "",
-        f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        f"**Articles Analyzed:** {total}",
-        f"**Source:** NewsAPI",
-        f"**Topic:** India Politics / India Government",
-        "",
-        "---",
-        "",
-        "## Summary",
-        "",
-        f"- **Positive:** {positive} articles",
-        f"- **Negative:** {negative} articles",
-        f"- **Neutral:** {neutral} articles",
-        "",
-        f"**Validation Rate:** {validated_count}/{total} analyses validated by LLM#2",
-        "",
-        "---",
-        "",
-        "## Detailed Analysis",
-        ""
-    ]
-    
-    for i, result in enumerate(validated_results, 1):
-        title = result.get("title", "Unknown Title")
-        url = result.get("url", "#")
-        source = result.get("source", "Unknown")
-        
-        analysis = result.get("analysis", {})
-        gist = analysis.get("gist", "N/A")
-        sentiment = analysis.get("sentiment", "N/A")
-        tone = analysis.get("tone", "N/A")
-        
-        validation = result.get("validation", {})
-        is_valid = validation.get("is_valid", False)
-        validation_notes = validation.get("validation_notes", "No validation performed")
-        suggested = validation.get("suggested_corrections")
-        
-        # Validation symbol
-        valid_symbol = "✓" if is_valid else "✗"
-        
-        report_lines.extend([
-            f"### Article {i}: \"{title[:80]}{'...' if len(title) > 80 else ''}\"",
-            "",
-            f"- **Source:** [{source}]({url})",
-            f"- **Gist:** {gist}",
-            f"- **LLM#1 Sentiment:** {sentiment.capitalize()}",
-            f"- **LLM#1 Tone:** {tone.capitalize()}",
-            f"- **LLM#2 Validation:** {valid_symbol} {validation_notes}",
-        ])
-        
-        if suggested:
-            corrections = ", ".join([f"{k}: {v}" for k, v in suggested.items()])
-            report_lines.append(f"- **Suggested Corrections:** {corrections}")
-        
-        report_lines.extend(["", "---", ""])
-    
-    # Write report
-    report_content = "\n".join(report_lines)
+    # Write the report block by block into a temp file and swap it in, so /report never
+    # sends a half-written report and concurrent /analyze runs can't interleave
     filepath = os.path.join(OUTPUT_DIR, "final_report.md")
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(report_content)
+    fd, tmp_path = tempfile.mkstemp(dir=OUTPUT_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write = f.write
+            write(
+                "# News Analysis Report\n"
+                "\n"
+                f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"**Articles Analyzed:** {total}\n"
+                "**Source:** NewsAPI\n"
+                "**Topic:** India Politics / India Government\n"
+                "\n"
+                "---\n"
+                "\n"
+                "## Summary\n"
+                "\n"
+                f"- **Positive:** {positive} articles\n"
+                f"- **Negative:** {negative} articles\n"
+                f"- **Neutral:** {neutral} articles\n"
+                "\n"
+                f"**Validation Rate:** {validated_count}/{total} analyses validated by LLM#2\n"
+                "\n"
+                "---\n"
+                "\n"
+                "## Detailed Analysis\n"
+            )
+            
+            for i, result in enumerate(validated_results, 1):
+                title = result.get("title", "Unknown Title")
+                url = result.get("url", "#")
+                source = result.get("source", "Unknown")
+                
+                analysis = result.get("analysis", {})
+                gist = analysis.get("gist", "N/A")
+                sentiment = analysis.get("sentiment", "N/A")
+                tone = analysis.get("tone", "N/A")
+                
+                validation = result.get("validation", {})
+                is_valid = validation.get("is_valid", False)
+                validation_notes = validation.get("validation_notes", "No validation performed")
+                suggested = validation.get("suggested_corrections")
+                
+                # Validation symbol
+                valid_symbol = "✓" if is_valid else "✗"
+                
+                write(
+                    "\n"
+                    f"### Article {i}: \"{title[:80]}{'...' if len(title) > 80 else ''}\"\n"
+                    "\n"
+                    f"- **Source:** [{source}]({url})\n"
+                    f"- **Gist:** {gist}\n"
+                    f"- **LLM#1 Sentiment:** {sentiment.capitalize()}\n"
+                    f"- **LLM#1 Tone:** {tone.capitalize()}\n"
+                    f"- **LLM#2 Validation:** {valid_symbol} {validation_notes}\n"
+                )
+                
+                if suggested:
+                    corrections = ", ".join([f"{k}: {v}" for k, v in suggested.items()])
+                    write(f"- **Suggested Corrections:** {corrections}\n")
+                
+                write("\n---\n")
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     
     return filepath
 
@@ -144,71 +223,52 @@ def analyze():
         # Get parameters
         data = request.get_json() or {}
         query = data.get("query", "India politics OR India government")
-        num_articles = data.get("num_articles", 15)
-        
-        print(f"\n{'='*60}")
-        print(f"Starting News Analysis Pipeline")
-        print(f"Query: {query}")
-        print(f"Articles: {num_articles}")
-        print(f"{'='*60}\n")
+        # Clients may send the count as a string ("5"); fetch_news needs an int to size the page
+        try:
+            num_articles = int(data.get("num_articles", 15))
+        except (TypeError, ValueError):
+            return jsonify({"error": "num_articles must be an integer"}), 400
+
+        log.info("Starting news analysis pipeline: query=%r, articles=%s", query, num_articles)
         
         # Step 1: Fetch news articles
-        print("Step 1: Fetching news articles...")
+        log.info("Step 1: Fetching news articles...")
         try:
             articles = fetch_news(query=query, num_articles=num_articles)
-            print(f"  ✓ Fetched {len(articles)} articles")
+            log.info("Fetched %d articles", len(articles))
         except NewsFetcherError as e:
             return jsonify({"error": f"Failed to fetch news: {e}"}), 500
         
-        # Save raw articles
-        save_json(articles, "raw_articles.json")
-        print(f"  ✓ Saved raw articles to output/raw_articles.json")
-        
-        # Step 2: Analyze with LLM#1 (Gemini)
-        print("\nStep 2: Analyzing with Gemini (LLM#1)...")
-        try:
-            analyses = analyze_articles(articles)
-            print(f"  ✓ Analyzed {len(analyses)} articles")
-        except AnalyzerError as e:
-            return jsonify({"error": f"Failed to analyze: {e}"}), 500
+        # Save raw articles in the background while the LLM steps run
+        save_json_in_background(articles, "raw_articles.json")
         
-        # Step 3: Validate with LLM#2 (OpenAI)
-        print("\nStep 3: Validating with OpenAI (LLM#2)...")
-        try:
-            validated_results = validate_analyses(articles, analyses)
-            print(f"  ✓ Validated {len(validated_results)} analyses")
-        except ValidatorError as e:
-            return jsonify({"error": f"Failed to validate: {e}"}), 500
+        # Steps 2-3: Analyze with LLM#1 and validate with LLM#2, per article,
+        # so each validation starts as soon as that article's analysis is done
+        log.info("Steps 2-3: Analyzing (LLM#1) and validating (LLM#2)...")
+        validated_results = run_pipeline(articles)
+        log.info("Analyzed and validated %d articles", len(validated_results))
         
-        # Save analysis results
-        save_json(validated_results, "analysis_results.json")
-        print(f"  ✓ Saved analysis results to output/analysis_results.json")
+        # Save analysis results in the background; the response doesn't wait on disk
+        save_json_in_background(validated_results, "analysis_results.json")
         
         # Step 4: Generate report
-        print("\nStep 4: Generating Markdown report...")
-        report_path = generate_markdown_report(validated_results, articles)
-        print(f"  ✓ Generated report at output/final_report.md")
-        
-        # Summary
-        positive = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "positive")
-        negative = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "negative")
-        neutral = sum(1 for r in validated_results if r.get("analysis", {}).get("sentiment") == "neutral")
-        validated = sum(1 for r in validated_results if r.get("validation", {}).get("is_valid", False))
-        
-        print(f"\n{'='*60}")
-        print(f"Analysis Complete!")
-        print(f"{'='*60}")
+        log.info("Step 4: Generating Markdown report...")
+        # One pass over the results feeds both the report and the response summary
+        stats = compute_stats(validated_results)
+        report_path = generate_markdown_report(validated_results, articles, stats)
+        log.info("Generated report at output/final_report.md")
+        log.info("Analysis complete")
         
         return jsonify({
             "status": "success",
             "summary": {
                 "total_articles": len(articles),
-                "analyzed": len(analyses),
-                "validated": validated,
+                "analyzed": len(validated_results),
+                "validated": stats["validated"],
                 "sentiment_breakdown": {
-                    "positive": positive,
-                    "negative": negative,
-                    "neutral": neutral
+                    "positive": stats["positive"],
+                    "negative": stats["negative"],
+                    "neutral": stats["neutral"]
                 }
             },
             "files": {
@@ -256,4 +316,14 @@ if __name__ == "__main__":
     print("  GET  /results  - Get JSON results")
     print("\n" + "="*60 + "\n")
     
-    app.run(debug=True, port=5000)
+    # Serve with waitress (production WSGI server, concurrent /analyze requests);
+    # FLASK_DEBUG=1 or a missing waitress falls back to Flask's debug server
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+    
+    if serve is None or os.getenv("FLASK_DEBUG") == "1":
+        app.run(debug=True, port=5000)
+    else:
+        serve(app, host="127.0.0.1", port=5000, threads=SERVER_THREADS)
@@ -4,13 +4,51 @@ Fetches news articles from NewsAPI about Indian politics.
 """
 
 import os
+import random
+import re
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster decoding of NewsAPI responses
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+
+# NewsAPI's largest page; pages are over-requested by ~1/3 so that rows dropped by the
+# cleaning loop ([Removed], too short, duplicates) still leave num_articles
+MAX_PAGE_SIZE = 100
+
+# Placeholder titles NewsAPI returns for withdrawn articles ("[Removed]", any spacing/case)
+_REMOVED_TITLE_RE = re.compile(r"\[\s*removed\s*\]", re.IGNORECASE)
+
+# Cleaned results are reused for identical (query, num_articles, language) calls within
+# this many seconds, saving a round-trip and the 100 requests/day developer quota
+FETCH_CACHE_TTL = 600
+FETCH_CACHE_SIZE = 128
+_fetch_cache: Dict[tuple, tuple] = {}
+_fetch_cache_lock = threading.Lock()
+
+# Seconds to wait for the TCP/TLS connect and for the response
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+
+# Keep-alive connections to newsapi.org, so repeat fetches skip the TCP/TLS handshake.
+# Each /analyze request or chat prompt makes at most one fetch (often a cache hit), so
+# a couple cover the usual overlap; extra concurrent fetches open a one-off connection.
+POOL_SIZE = 2
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+
+
 class NewsFetcherError(Exception):
     """Custom exception for news fetching errors."""
     pass
@@ -19,7 +57,8 @@ class NewsFetcherError(Exception):
 def fetch_news(
     query: str = "India politics OR India government",
     num_articles: int = 15,
-    language: str = "en"
+    language: str = "en",
+    max_retries: int = 3
 ) -> List[Dict]:
     """
     Fetch news articles from NewsAPI.
@@ -28,6 +67,7 @@ def fetch_news(
         query: Search query for news articles
         num_articles: Number of articles to fetch (10-15 recommended)
         language: Language code for articles
+        max_retries: Number of attempts for transient network/API errors
         
     Returns:
         List of article dictionaries with title, description, content, url, source
@@ -39,31 +79,49 @@ def fetch_news(
     if not api_key or api_key == "your_newsapi_key_here":
         raise NewsFetcherError("NEWSAPI_KEY not configured in .env file")
     
-    url = "https://newsapi.org/v2/everything"
+    cache_key = (query, num_articles, language)
+    with _fetch_cache_lock:
+        cached = _fetch_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < FETCH_CACHE_TTL:
+        return [dict(article) for article in cached[1]]
+    
     params = {
         "q": query,
         "language": language,
-        "pageSize": num_articles,
+        "pageSize": min(num_articles + num_articles // 3 + 2, MAX_PAGE_SIZE),
         "sortBy": "publishedAt",
         "apiKey": api_key
     }
     
-    try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-    except requests.exceptions.Timeout:
-        raise NewsFetcherError("NewsAPI request timed out. Please try again.")
-    except requests.exceptions.ConnectionError:
-        raise NewsFetcherError("Failed to connect to NewsAPI. Check your internet connection.")
-    except requests.exceptions.HTTPError as e:
-        if response.status_code == 401:
-            raise NewsFetcherError("Invalid NewsAPI key. Please check your API key.")
-        elif response.status_code == 429:
-            raise NewsFetcherError("NewsAPI rate limit exceeded. Please wait and try again.")
-        else:
-            raise NewsFetcherError(f"NewsAPI HTTP error: {e}")
+    # Transient failures (timeouts, dropped connections, 5xx) are retried with jittered
+    # exponential backoff; anything else fails straight away. A 429 on the developer plan
+    # means the daily quota is spent, so waiting a few seconds wouldn't help.
+    attempts = max(1, max_retries)
+    for attempt in range(attempts):
+        try:
+            response = _session.get(NEWSAPI_URL, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            response.raise_for_status()
+            break
+        except requests.exceptions.Timeout:
+            last_error = NewsFetcherError("NewsAPI request timed out. Please try again.")
+        except requests.exceptions.ConnectionError:
+            last_error = NewsFetcherError("Failed to connect to NewsAPI. Check your internet connection.")
+        except requests.exceptions.HTTPError as e:
+            if response.status_code == 401:
+                raise NewsFetcherError("Invalid NewsAPI key. Please check your API key.")
+            elif response.status_code == 429:
+                raise NewsFetcherError("NewsAPI rate limit exceeded. Please wait and try again.")
+            elif response.status_code >= 500:
+                last_error = NewsFetcherError(f"NewsAPI HTTP error: {e}")
+            else:
+                raise NewsFetcherError(f"NewsAPI HTTP error: {e}")
+        
+        if attempt == attempts - 1:
+            raise last_error
+        time.sleep(2 ** attempt + random.uniform(0, 0.5))
     
-    data = response.json()
+    # orjson parses the raw bytes directly, skipping requests' text decode
+    data = orjson.loads(response.content) if orjson is not None else response.json()
     
     if data.get("status") != "ok":
         error_msg = data.get("message", "Unknown error from NewsAPI")
@@ -76,35 +134,61 @@ def fetch_news(
     
     # Clean and structure the articles
     cleaned_articles = []
-    for i, article in enumerate(articles):
+    append = cleaned_articles.append
+    seen_urls = set()
+    for article_id, article in enumerate(articles, start=1):
+        get = article.get
+        
         # Skip articles with missing essential content
-        title = article.get("title", "").strip()
-        if not title or title == "[Removed]":
+        title = (get("title") or "").strip()
+        if not title or _REMOVED_TITLE_RE.fullmatch(title):
             continue
-            
-        content = article.get("content") or article.get("description") or ""
-        content = content.strip()
         
-        # Skip if no meaningful content
-        if not content or len(content) < 50:
+        # Skip if no meaningful content (also covers empty content)
+        content = (get("content") or get("description") or "").strip()
+        if len(content) < 50:
             continue
         
-        cleaned_article = {
-            "id": i + 1,
+        # Skip duplicates (syndicated copies, tracking-parameter variants) before they cost LLM calls
+        url = get("url") or ""
+        canonical_url = url.split("?")[0].rstrip("/").lower()
+        if canonical_url:
+            if canonical_url in seen_urls:
+                continue
+            seen_urls.add(canonical_url)
+        
+        append({
+            "id": article_id,
             "title": title,
-            "description": (article.get("description") or "").strip(),
+            "description": (get("description") or "").strip(),
             "content": content,
-            "url": article.get("url", ""),
-            "source": article.get("source", {}).get("name", "Unknown"),
-            "published_at": article.get("publishedAt", ""),
-            "author": article.get("author") or "Unknown"
-        }
-        cleaned_articles.append(cleaned_article)
+            "url": url,
+            "source": (get("source") or {}).get("name", "Unknown"),
+            "published_at": get("publishedAt", ""),
+            "author": get("author") or "Unknown"
+        })
+        if len(cleaned_articles) == num_articles:
+            break
     
     if not cleaned_articles:
         raise NewsFetcherError("All fetched articles had invalid or missing content.")
     
-    return cleaned_articles
+    with _fetch_cache_lock:
+        # Drop expired entries, then the oldest ones, to stay within FETCH_CACHE_SIZE
+        now = time.monotonic()
+        for key in [k for k, (stored_at, _) in _fetch_cache.items() if now - stored_at >= FETCH_CACHE_TTL]:
+            del _fetch_cache[key]
+        while len(_fetch_cache) >= FETCH_CACHE_SIZE:
+            del _fetch_cache[next(iter(_fetch_cache))]
+        _fetch_cache[cache_key] = (now, cleaned_articles)
+    
+    return [dict(article) for article in cleaned_articles]
+
+
+def clear_fetch_cache():
+    """Forget cached fetch_news results, e.g. between tests."""
+    with _fetch_cache_lock:
+        _fetch_cache.clear()
 
 
 def get_article_text(article: Dict) -> str:
@@ -117,15 +201,15 @@ def get_article_text(article: Dict) -> str:
     Returns:
         Combined title, description, and content as a single string
     """
-    parts = []
-    if article.get("title"):
-        parts.append(f"Title: {article['title']}")
-    if article.get("description"):
-        parts.append(f"Description: {article['description']}")
-    if article.get("content"):
-        parts.append(f"Content: {article['content']}")
+    title = article.get("title")
+    description = article.get("description")
+    content = article.get("content")
     
-    return "\n".join(parts)
+    return "\n".join(filter(None, (
+        title and f"Title: {title}",
+        description and f"Description: {description}",
+        content and f"Content: {content}",
+    )))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""
+Pipeline Module
+Runs analyze (LLM#1) -> validate (LLM#2) over a batch of articles concurrently.
+Shared by the Flask API and the Streamlit app.
+"""
+
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from llm_analyzer import analyze_article, build_result, AnalyzerError
+from llm_validator import validate_result
+
+log = logging.getLogger(__name__)
+
+
+# Concurrent analyze -> validate pipelines. The work is network-bound, so this
+# is capped by provider rate limits (OpenRouter's free tier) rather than CPUs.
+PIPELINE_WORKERS = 8
+
+
+def process_article(index: int, article: Dict) -> Dict:
+    """Analyze one article with LLM#1, then validate it with LLM#2 as soon as the analysis is ready."""
+    log.info("Processing article %d: %s", index + 1, article.get("title", "Unknown")[:50])
+    try:
+        result = build_result(article, index, analyze_article(article))
+    except AnalyzerError as e:
+        result = build_result(article, index, error=str(e))
+    return validate_result(article, result)
+
+
+def iter_pipeline(
+    articles: List[Dict],
+    process: Callable[[int, Dict], Dict] = process_article,
+    max_workers: int = PIPELINE_WORKERS
+) -> Iterator[Tuple[int, Dict]]:
+    """
+    Run process over all articles concurrently, yielding results as they finish.
+    
+    Args:
+        articles: Articles from fetch_news
+        process: Per-article pipeline taking (index, article) and returning a validated result
+        max_workers: Maximum number of articles in flight at once
+        
+    Yields:
+        (index, result) pairs in completion order; an unexpected exception for one
+        article becomes an error result for it instead of aborting the batch
+    """
+    total = len(articles)
+    if not total:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+        futures = {executor.submit(process, i, article): i for i, article in enumerate(articles)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                log.exception("Pipeline failed for article %d", index + 1)
+                failed = build_result(articles[index], index, error=f"Unexpected error: {e}")
+                result = validate_result(articles[index], failed)
+            yield index, result
+
+
+def run_pipeline(
+    articles: List[Dict],
+    process: Callable[[int, Dict], Dict] = process_article,
+    max_workers: int = PIPELINE_WORKERS
+) -> List[Dict]:
+    """
+    Analyze and validate all articles concurrently.
+    
+    Args:
+        articles: Articles from fetch_news
+        process: Per-article pipeline taking (index, article) and returning a validated result
+        max_workers: Maximum number of articles in flight at once
+        
+    Returns:
+        Validated results in article order
+    """
+    results = [None] * len(articles)
+    for index, result in iter_pipeline(articles, process, max_workers):
+        results[index] = result
+    return results
+
+
+def compute_stats(validated_results: list) -> dict:
+    """Count sentiments and validations in a single pass over the results."""
+    sentiments = Counter()
+    validated = 0
+    for r in validated_results:
+        sentiments[(r.get("analysis") or {}).get("sentiment")] += 1
+        validated += bool((r.get("validation") or {}).get("is_valid", False))
+    return {
+        "total": len(validated_results),
+        "positive": sentiments["positive"],
+        "negative": sentiments["negative"],
+        "neutral": sentiments["neutral"],
+        "validated": validated,
+    }
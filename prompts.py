@@ -0,0 +1,24 @@
+"""
+Prompts Module
+Article text shared by the analyzer (LLM#1) and validator (LLM#2) prompts.
+"""
+
+from typing import Dict
+
+
+def get_prompt_text(article: Dict) -> str:
+    """
+    Format an article for the analyzer and validator prompts.
+    
+    Args:
+        article: Article dictionary
+        
+    Returns:
+        Title, source, description and content as labelled lines
+    """
+    return (
+        f"Title: {article.get('title', 'No title')}\n"
+        f"Source: {article.get('source', 'Unknown')}\n"
+        f"Description: {article.get('description', 'No description')}\n"
+        f"Content: {article.get('content', 'No content')}"
+    ).strip()
@@ -0,0 +1,57 @@
+"""
+Rate Limiter Module
+Token-bucket limiter that keeps LLM calls under a provider's requests-per-minute quota.
+"""
+
+import os
+import time
+import threading
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` calls per `period` seconds.
+
+    Calls run at full speed while the bucket has tokens (bursts up to `rate`) and
+    only wait once the budget is spent. A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / period if rate > 0 else 0.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        if self.fill_rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+
+def limiter_from_env(name: str, default_rpm: float) -> RateLimiter:
+    """
+    Build a per-minute limiter from an environment variable.
+
+    Args:
+        name: Environment variable holding the requests-per-minute quota
+        default_rpm: Quota used when the variable is unset or not a number
+
+    Returns:
+        RateLimiter for that quota
+    """
+    try:
+        rpm = float(os.getenv(name, default_rpm))
+    except ValueError:
+        rpm = default_rpm
+    return RateLimiter(rpm)
@@ -0,0 +1,125 @@
+"""
+Response Cache Module
+Small LRU cache for LLM responses, mirrored to a JSON file so it survives restarts.
+"""
+
+import os
+import json
+import time
+import atexit
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+
+# Minimum seconds between rewrites of a cache file; entries added in between are
+# written by the next due set(), flush() or at interpreter exit
+SAVE_INTERVAL = 5.0
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU mapping of string keys to JSON-serializable dicts.
+
+    The file is read on first use and rewritten at most every SAVE_INTERVAL seconds
+    while there are new entries, plus once at exit. Disk errors are ignored (e.g. on
+    a read-only deployment), leaving an in-memory cache.
+    """
+
+    def __init__(self, filename: str, maxsize: int = 1024):
+        self.path = os.path.join(OUTPUT_DIR, filename)
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        self._last_save = 0.0
+        # Held while writing, so the file is rewritten by one thread at a time
+        self._save_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def _load(self):
+        """Read the cache file once; a missing or corrupt file starts an empty cache."""
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self._entries.update(list(entries.items())[-self.maxsize:])
+
+    def _save(self, entries: Dict[str, Dict]):
+        """Write a snapshot atomically so a crash mid-write can't corrupt the file."""
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # A unique temp name, so processes sharing output/ (Flask, Streamlit) can't collide
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def flush(self, blocking: bool = True):
+        """
+        Write pending entries to disk.
+
+        Args:
+            blocking: Wait for a write already in progress; if False, leave the
+                entries pending for the next flush instead
+        """
+        if not self._save_lock.acquire(blocking=blocking):
+            return
+        try:
+            # Snapshot under the lock, then serialize outside it so readers aren't blocked
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = dict(self._entries)
+                self._dirty = False
+                self._last_save = time.monotonic()
+            self._save(entries)
+        finally:
+            self._save_lock.release()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached value, or None on a miss."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+            return dict(value)
+
+    def clear(self):
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._loaded = True
+            self._entries.clear()
+            self._dirty = True
+        self.flush()
+
+    def set(self, key: str, value: Dict):
+        """Store a copy of value, evicting the least recently used entry when full."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._entries[key] = dict(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= SAVE_INTERVAL
+        if due:
+            self.flush(blocking=False)
@@ -0,0 +1,137 @@
+"""
+Shared pytest fixtures for the News Analyzer tests.
+"""
+
+import pytest
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_fetcher
+from news_fetcher import fetch_news, NewsFetcherError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Background NewsAPI fetch started once collection is done, shared by the live tests
+NEWS_FUTURE_KEY = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-live", action="store_true", default=False,
+        help="Skip tests that call NewsAPI or the LLM APIs and use static article fixtures"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "live: test calls a live external API (skipped with --no-live)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--no-live"):
+        return
+    skip_live = pytest.mark.skip(reason="live API test (--no-live)")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+def pytest_collection_finish(session):
+    # Start the fetch before the first test runs, so the round-trip overlaps the offline
+    # tests; skipped with --no-live or when no collected test uses the articles
+    if session.config.getoption("--no-live"):
+        return
+    if any({"news_future", "articles"} & set(item.fixturenames) for item in session.items):
+        session.config.stash[NEWS_FUTURE_KEY] = start_news_fetch()
+
+
+def start_news_fetch():
+    """Run fetch_news(num_articles=3) on a background thread and return its Future."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fetch_news")
+    future = executor.submit(fetch_news, num_articles=3)
+    # The submitted fetch still runs; the thread exits once it is done
+    executor.shutdown(wait=False)
+    return future
+
+
+def load_fixture(name: str):
+    """Load a JSON file from tests/fixtures."""
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class RecordedResponse:
+    """Stand-in for requests.Response that replays a recorded body."""
+    
+    status_code = 200
+    
+    def __init__(self, content: bytes):
+        self.content = content
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+@pytest.fixture
+def settled_news_fetch(request):
+    """
+    Wait for the session's background NewsAPI fetch, if one was started.
+    
+    Tests that patch news_fetcher's session or clear its cache use this, so the
+    live fetch can't read their fake responses or lose its cached result to them.
+    """
+    future = request.config.stash.get(NEWS_FUTURE_KEY, None)
+    if future is not None:
+        wait([future])
+
+
+@pytest.fixture
+def recorded_newsapi(monkeypatch, settled_news_fetch):
+    """
+    Serve fetch_news from tests/fixtures/newsapi_everything.json instead of the network.
+    
+    Yields the params of each request made, so tests can check what would have been sent.
+    """
+    with open(os.path.join(FIXTURES_DIR, "newsapi_everything.json"), "rb") as f:
+        body = f.read()
+    requests_made = []
+    
+    def fake_get(url, params=None, **kwargs):
+        requests_made.append(params)
+        return RecordedResponse(body)
+    
+    monkeypatch.setenv("NEWSAPI_KEY", "test-key")
+    monkeypatch.setattr(news_fetcher._session, "get", fake_get)
+    news_fetcher.clear_fetch_cache()
+    yield requests_made
+    news_fetcher.clear_fetch_cache()
+
+
+@pytest.fixture(scope="session")
+def news_future(request):
+    """NewsAPI fetch started in the background at collection; tests call .result() only when they need the articles."""
+    future = request.config.stash.get(NEWS_FUTURE_KEY, None)
+    if future is None:
+        future = start_news_fetch()
+    return future
+
+
+@pytest.fixture(scope="session")
+def articles(request):
+    """
+    Articles shared by the LLM tests: fetched live once per session, or the static
+    tests/fixtures/articles.json with --no-live or when NewsAPI is unavailable.
+    """
+    if not request.config.getoption("--no-live"):
+        try:
+            return request.getfixturevalue("news_future").result()
+        except NewsFetcherError:
+            pass
+    return load_fixture("articles.json")